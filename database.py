@@ -15,6 +15,18 @@ load_dotenv()
 MONGODB_URI = os.getenv("MONGODB_URI", "mongodb://localhost:27017")
 MONGODB_DB_NAME = os.getenv("MONGODB_DB_NAME", "mcq_generator")
 
+# Connection pool tuning (applies to both clients)
+MONGODB_MAX_POOL_SIZE = int(os.getenv("MONGODB_MAX_POOL_SIZE", "100"))
+MONGODB_MIN_POOL_SIZE = int(os.getenv("MONGODB_MIN_POOL_SIZE", "10"))
+MONGODB_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv("MONGODB_SERVER_SELECTION_TIMEOUT_MS", "5000"))
+
+# Wire compression: stems/explanations/context are long markdown+LaTeX
+# strings that compress well, so this cuts bytes on the wire for every
+# insert and query against a remote Atlas cluster. The server negotiates
+# the first compressor it supports from this list (zlib is the
+# always-available fallback; zstd/snappy require the optional packages).
+MONGODB_COMPRESSORS = os.getenv("MONGODB_COMPRESSORS", "zstd,snappy,zlib")
+
 # Synchronous client for non-async operations
 _sync_client = None
 _sync_db = None
@@ -24,13 +36,25 @@ def get_sync_database():
     """
     Get synchronous MongoDB database instance.
     Used for operations within the existing MCQ generator workflow.
+
+    The client is created once per process and shared by every caller, so
+    storage services reuse pooled connections instead of paying TCP + TLS
+    + SCRAM handshakes on each request.
     """
     global _sync_client, _sync_db
-    
+
     if _sync_db is None:
-        _sync_client = MongoClient(MONGODB_URI)
+        _sync_client = MongoClient(
+            MONGODB_URI,
+            maxPoolSize=MONGODB_MAX_POOL_SIZE,
+            minPoolSize=MONGODB_MIN_POOL_SIZE,
+            serverSelectionTimeoutMS=MONGODB_SERVER_SELECTION_TIMEOUT_MS,
+            retryWrites=True,
+            compressors=MONGODB_COMPRESSORS,
+            zlibCompressionLevel=6
+        )
         _sync_db = _sync_client[MONGODB_DB_NAME]
-    
+
     return _sync_db
 
 
@@ -54,7 +78,14 @@ async def get_async_database():
     global _async_client, _async_db
     
     if _async_db is None:
-        _async_client = AsyncIOMotorClient(MONGODB_URI)
+        _async_client = AsyncIOMotorClient(
+            MONGODB_URI,
+            maxPoolSize=MONGODB_MAX_POOL_SIZE,
+            minPoolSize=MONGODB_MIN_POOL_SIZE,
+            serverSelectionTimeoutMS=MONGODB_SERVER_SELECTION_TIMEOUT_MS,
+            compressors=MONGODB_COMPRESSORS,
+            zlibCompressionLevel=6
+        )
         _async_db = _async_client[MONGODB_DB_NAME]
     
     return _async_db
@@ -6,7 +6,7 @@ Provides CLI and programmatic interfaces for generating MCQs.
 
 import os
 import argparse
-from typing import Optional, Literal
+from typing import Callable, Optional, Literal
 from dotenv import load_dotenv
 
 from graph import create_mcq_graph
@@ -57,17 +57,22 @@ class MCQGenerator:
         input_path: str,
         input_type: Literal["chapter", "mcqs"] = "chapter",
         output_path: Optional[str] = None,
-        include_explanations: bool = True
+        include_explanations: bool = True,
+        on_mcq: Optional[Callable] = None
     ):
         """
         Generate MCQs from input file.
-        
+
         Args:
             input_path: Path to chapter.md or existing MCQ file
             input_type: "chapter" or "mcqs"
             output_path: Where to save generated MCQs (optional)
             include_explanations: Include explanation section in output
-        
+            on_mcq: Optional callback invoked with each CompleteMCQ as it
+                is assembled, before the run finishes - lets callers
+                stream results out (e.g. background DB writes) while the
+                pipeline is still working
+
         Returns:
             List of CompleteMCQ objects
         """
@@ -96,6 +101,7 @@ class MCQGenerator:
             config={
                 "llm_provider": self.llm_provider,
                 "model": self.model,
+                "on_mcq": on_mcq,
             },
             metrics={}
         )
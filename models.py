@@ -182,7 +182,7 @@ class GenerateMCQResponse(BaseModel):
     difficulty_distribution: Dict[str, int]
     metrics: Dict
     mcqs: List[MCQResponse]
-    markdown_content: str
+    markdown_content: Optional[str] = None
 
 
 class MCQListResponse(BaseModel):
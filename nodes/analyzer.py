@@ -15,10 +15,7 @@ import os
 from datetime import datetime
 from typing import List, Dict
 from langchain_core.messages import SystemMessage, HumanMessage
-from langchain_openai import ChatOpenAI
-from langchain_anthropic import ChatAnthropic
-from langchain_google_genai import ChatGoogleGenerativeAI
-from utils.groq_wrapper import ChatGroq
+from utils.llm_factory import get_llm
 
 from state import MCQGeneratorState, ConceptJSON
 
@@ -286,16 +283,7 @@ def content_analyzer_node(state: MCQGeneratorState) -> Dict:
     llm_provider = state["config"].get("llm_provider", "groq")
     model = state["config"].get("model", "openai/gpt-oss-120b")
     
-    if llm_provider == "anthropic":
-        llm = ChatAnthropic(model=model, temperature=0.3)
-    elif llm_provider == "openai":
-        llm = ChatOpenAI(model=model, temperature=0.3)
-    elif llm_provider == "gemini":
-        llm = ChatGoogleGenerativeAI(model=model, temperature=0.3)
-    elif llm_provider == "groq":
-        llm = ChatGroq(model=model, temperature=0.3)
-    else:
-        raise ValueError(f"Unsupported LLM provider: {llm_provider}")
+    llm = get_llm(llm_provider, model, temperature=0.3)
     
     # Read input file
     with open(state["input_source"], "r", encoding="utf-8") as f:
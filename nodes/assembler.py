@@ -140,6 +140,11 @@ def assembler_node(state: MCQGeneratorState) -> Dict:
     
     questions_with_distractors = state["questions_with_distractors"]
     print(f"Assembling {len(questions_with_distractors)} complete MCQs")
+
+    # Optional per-MCQ callback (e.g. the storage service's background
+    # writer): each MCQ streams out as soon as it is assembled instead of
+    # waiting for the whole run to finish
+    on_mcq = state.get("config", {}).get("on_mcq")
     
     # Handle empty case
     if len(questions_with_distractors) == 0:
@@ -192,7 +197,9 @@ def assembler_node(state: MCQGeneratorState) -> Dict:
         )
         
         final_mcqs.append(mcq)
-        
+        if on_mcq is not None:
+            on_mcq(mcq)
+
         print(f"  ✓ Assembled with options: {', '.join(shuffled['options'].keys())}")
         print(f"  ✓ Correct answer: ({shuffled['correct_key']})")
     
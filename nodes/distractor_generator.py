@@ -8,10 +8,7 @@ Each distractor simulates a specific student mistake pattern.
 import random
 from typing import Dict, List
 from langchain_core.messages import SystemMessage, HumanMessage
-from langchain_openai import ChatOpenAI
-from langchain_anthropic import ChatAnthropic
-from langchain_google_genai import ChatGoogleGenerativeAI
-from utils.groq_wrapper import ChatGroq
+from utils.llm_factory import get_llm
 
 from state import MCQGeneratorState, ValidatedQuestion, Distractor
 from error_taxonomy import get_applicable_errors, ErrorType, ERROR_TAXONOMY
@@ -209,16 +206,7 @@ def distractor_generator_node(state: MCQGeneratorState) -> Dict:
     llm_provider = state["config"].get("llm_provider", "groq")
     model = state["config"].get("model", "openai/gpt-oss-120b")
     
-    if llm_provider == "anthropic":
-        llm = ChatAnthropic(model=model, temperature=0.7)
-    elif llm_provider == "openai":
-        llm = ChatOpenAI(model=model, temperature=0.7)
-    elif llm_provider == "gemini":
-        llm = ChatGoogleGenerativeAI(model=model, temperature=0.7)
-    elif llm_provider == "groq":
-        llm = ChatGroq(model=model, temperature=0.7)
-    else:
-        raise ValueError(f"Unsupported LLM provider: {llm_provider}")
+    llm = get_llm(llm_provider, model, temperature=0.7)
     
     questions_with_distractors = []
     total_distractors_generated = 0
@@ -7,13 +7,11 @@ Processes batches of 10-15 concepts to prevent hallucination through focused pro
 Includes loopback logic: after processing current batch, loads next batch if queue not empty.
 """
 
+import os
 import uuid
 from typing import Dict, List
 from langchain_core.messages import SystemMessage, HumanMessage
-from langchain_openai import ChatOpenAI
-from langchain_anthropic import ChatAnthropic
-from langchain_google_genai import ChatGoogleGenerativeAI
-from utils.groq_wrapper import ChatGroq
+from utils.llm_factory import get_llm
 
 from state import MCQGeneratorState, ConceptJSON, StemWithAnswer
 from utils.latex_validator import validate_latex_syntax, extract_latex_from_markdown
@@ -58,6 +56,13 @@ LATEX RULES:
 Return ONLY valid JSON, no markdown code blocks."""
 
 
+# How many concepts to pack into a single LLM call. Packing amortizes the
+# per-call HTTP round-trip and system-prompt tokens across several
+# concepts, which matters once the provider's requests-per-minute limit
+# becomes the bottleneck.
+STEM_ROWS_PER_CALL = int(os.getenv("STEM_ROWS_PER_CALL", "5"))
+
+
 def generate_stem_for_concept(concept: ConceptJSON, llm) -> Dict:
     """
     Generate a single question stem with correct answer for one concept.
@@ -115,6 +120,83 @@ Return JSON with: stem, correct_answer, integral_type, reasoning"""
         return None
 
 
+def generate_stems_for_concepts(concepts: List[ConceptJSON], llm) -> Dict[str, Dict]:
+    """
+    Generate question stems for several concepts in a single LLM call.
+
+    Packs up to STEM_ROWS_PER_CALL concepts into one prompt and asks for
+    a JSON array with one entry per concept. Falls back to per-concept
+    generation if the batched response cannot be parsed.
+
+    Args:
+        concepts: Concepts to generate questions for (one call's worth)
+        llm: Language model for generation
+
+    Returns:
+        Mapping of concept_id -> result dict (stem, correct_answer,
+        integral_type, reasoning); concepts that failed are absent
+    """
+    concept_blocks = []
+    for concept in concepts:
+        example = concept.get('worked_example')
+        concept_blocks.append(f"""Concept ID: {concept['concept_id']}
+Concept: {concept['concept_name']}
+Formula: {concept['formula']}
+Difficulty: {concept['difficulty']}
+Context: {concept['context']}
+{f"Example: {example}" if example else ""}""")
+
+    prompt = f"""Generate ONE MCQ question for EACH of these {len(concepts)} concepts:
+
+{chr(10).join(concept_blocks)}
+
+For each concept, create a question matching its difficulty level that tests
+understanding of that specific concept. Each question should be clear,
+unambiguous, and have one correct answer.
+
+Return a JSON array with one object per concept, each with:
+concept_id, stem, correct_answer, integral_type, reasoning"""
+
+    messages = [
+        SystemMessage(content=STEM_GENERATOR_SYSTEM_PROMPT),
+        HumanMessage(content=prompt)
+    ]
+
+    response = llm.invoke(messages)
+
+    # Parse response
+    import json
+    import re
+
+    try:
+        content_text = response.content
+
+        # Extract JSON from markdown code blocks if present
+        if "```json" in content_text:
+            json_match = re.search(r"```json\s*(.*?)\s*```", content_text, re.DOTALL)
+            if json_match:
+                content_text = json_match.group(1)
+        elif "```" in content_text:
+            json_match = re.search(r"```\s*(.*?)\s*```", content_text, re.DOTALL)
+            if json_match:
+                content_text = json_match.group(1)
+
+        results = json.loads(content_text)
+        if isinstance(results, dict):
+            results = [results]
+
+        return {r["concept_id"]: r for r in results if "concept_id" in r}
+
+    except (json.JSONDecodeError, KeyError, TypeError) as e:
+        print(f"Error parsing batched stem JSON, falling back to per-concept calls: {e}")
+        results_by_id = {}
+        for concept in concepts:
+            result = generate_stem_for_concept(concept, llm)
+            if result is not None:
+                results_by_id[concept['concept_id']] = result
+        return results_by_id
+
+
 def stem_generator_node(state: MCQGeneratorState) -> Dict:
     """
     LangGraph node that generates stems for current batch of concepts.
@@ -136,30 +218,27 @@ def stem_generator_node(state: MCQGeneratorState) -> Dict:
     llm_provider = state["config"].get("llm_provider", "groq")
     model = state["config"].get("model", "openai/gpt-oss-120b")
     
-    if llm_provider == "anthropic":
-        llm = ChatAnthropic(model=model, temperature=0.5)
-    elif llm_provider == "openai":
-        llm = ChatOpenAI(model=model, temperature=0.5)
-    elif llm_provider == "gemini":
-        llm = ChatGoogleGenerativeAI(model=model, temperature=0.5)
-    elif llm_provider == "groq":
-        llm = ChatGroq(model=model, temperature=0.5)
-    else:
-        raise ValueError(f"Unsupported LLM provider: {llm_provider}")
+    llm = get_llm(llm_provider, model, temperature=0.5)
     
-    # Generate stems for each concept in current batch
+    # Generate stems for the batch, packing several concepts per LLM call
     new_stems = []
     processed_ids = state.get("processed_concept_ids", [])
-    
+
+    results_by_id = {}
+    for start in range(0, len(current_batch), STEM_ROWS_PER_CALL):
+        chunk = current_batch[start:start + STEM_ROWS_PER_CALL]
+        print(f"\nGenerating questions for concepts {start+1}-{start+len(chunk)} of {len(current_batch)} (1 LLM call)")
+        results_by_id.update(generate_stems_for_concepts(chunk, llm))
+
     for i, concept in enumerate(current_batch):
-        print(f"\n[{i+1}/{len(current_batch)}] Generating question for: {concept['concept_name']}")
-        
-        result = generate_stem_for_concept(concept, llm)
-        
+        print(f"\n[{i+1}/{len(current_batch)}] Processing question for: {concept['concept_name']}")
+
+        result = results_by_id.get(concept['concept_id'])
+
         if result is None:
             print(f"  ⚠ Failed to generate stem for {concept['concept_id']}")
             continue
-        
+
         # Validate LaTeX in stem and answer
         stem_latex = extract_latex_from_markdown(result['stem'])
         answer_latex = extract_latex_from_markdown(result['correct_answer'])
@@ -6,15 +6,22 @@ Wraps the existing MCQGenerator without modifying its internal logic.
 """
 
 import os
-import uuid
+import json
+import queue
+import asyncio
+import logging
 import tempfile
+from logging.handlers import QueueHandler, QueueListener
+from collections import Counter
 from datetime import datetime
 from typing import Optional, List
-from fastapi import FastAPI, File, UploadFile, Form, HTTPException, Query
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, File, UploadFile, Form, HTTPException, Query, Request
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
 
+from bson import ObjectId
+
 from main import MCQGenerator
 from storage import MCQStorageService
 from database import get_async_database, close_async_database, COLLECTIONS
@@ -27,11 +34,27 @@ from nodes.assembler import export_mcqs_to_markdown
 # Load environment variables
 load_dotenv()
 
+# Request-path logging goes through a QueueHandler so the actual stdout
+# write happens on the listener's background thread instead of blocking
+# the request (stdout can stall when piped under Gunicorn/systemd).
+# %s-style arguments are only formatted if the level is enabled.
+logger = logging.getLogger("mcq.server")
+if not logger.handlers:
+    _log_queue = queue.SimpleQueue()
+    _stream_handler = logging.StreamHandler()
+    _stream_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    _log_listener = QueueListener(_log_queue, _stream_handler)
+    _log_listener.start()
+    logger.addHandler(QueueHandler(_log_queue))
+    logger.setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
+    logger.propagate = False
+
 # Initialize FastAPI app
 app = FastAPI(
     title="MCQ Generator API",
     description="Generate high-quality multiple-choice questions for calculus/integration topics",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse  # orjson is much faster on large MCQ payloads
 )
 
 # Add CORS middleware
@@ -48,20 +71,117 @@ DEFAULT_LLM_PROVIDER = os.getenv("DEFAULT_LLM_PROVIDER", "gemini")
 DEFAULT_MODEL = os.getenv("DEFAULT_MODEL", "gemini-2.5-pro")
 DEFAULT_BATCH_SIZE = int(os.getenv("DEFAULT_BATCH_SIZE", "15"))
 
+# Upload limits: reject oversized files before buffering them in memory
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(10 * 1024 * 1024)))  # 10 MB
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # Read uploads in 1 MB chunks
+
+# Projections limiting find() results to the fields the response models
+# actually use, so Mongo doesn't ship (and we don't decode) unused fields
+MCQ_PROJECTION = {
+    "_id": 1, "session_id": 1, "subject": 1, "chapter": 1,
+    "question_number": 1, "concept_id": 1, "stem": 1, "options": 1,
+    "correct_answer": 1, "explanation": 1, "metadata": 1, "created_at": 1
+}
+SESSION_PROJECTION = {
+    "_id": 1, "session_id": 1, "subject": 1, "chapter": 1,
+    "input_filename": 1, "input_type": 1, "llm_provider": 1, "model": 1,
+    "total_concepts_extracted": 1, "total_mcqs_generated": 1,
+    "difficulty_distribution": 1, "status": 1, "created_at": 1,
+    "completed_at": 1
+}
+
+# Cached database handle, set once in startup_event so endpoints don't
+# re-resolve it on every request
+db = None
+
+# In-process job queue for submitted generation jobs, created on startup.
+# Jobs are consumed by generation_worker so HTTP requests return
+# immediately instead of holding a socket open for minutes.
+generation_queue = None
+_generation_worker_task = None
+
+
+async def ensure_indexes(db):
+    """
+    Create the indexes used by the list/fetch endpoints.
+
+    Idempotent - safe to run on every startup. Uses background builds so
+    the first run on a populated collection doesn't block writes.
+    """
+    mcqs_col = db[COLLECTIONS["mcqs"]]
+    sessions_col = db[COLLECTIONS["mcq_sessions"]]
+
+    # Covers the post-insert reload and list_mcqs sort on question_number
+    await mcqs_col.create_index(
+        [("session_id", 1), ("question_number", 1)], background=True
+    )
+    # Covers list_mcqs subject + difficulty filters with sorted pagination
+    await mcqs_col.create_index(
+        [("subject", 1), ("metadata.difficulty", 1), ("question_number", 1)],
+        background=True
+    )
+    # Covers list_sessions filter + created_at sort
+    await sessions_col.create_index(
+        [("subject", 1), ("created_at", -1)], background=True
+    )
+    # Covers get_session lookups
+    await sessions_col.create_index("session_id", unique=True, background=True)
+
+
+async def generation_worker():
+    """
+    Background task that drains the generation queue.
+
+    Each job runs the full pipeline in a worker thread; progress and
+    final status land in the mcq_sessions collection, which clients poll
+    via GET /sessions/{session_id}.
+    """
+    while True:
+        job = await generation_queue.get()
+        try:
+            await asyncio.to_thread(
+                run_generation_pipeline,
+                job["storage"],
+                job["temp_file_path"],
+                job["input_filename"],
+                job["subject"],
+                job["chapter"],
+                job["input_type"],
+                job["include_explanations"],
+                False  # session record already created at submit time
+            )
+        except Exception as e:
+            logger.exception("Background generation failed for session %s", job['storage'].session_id)
+            job["storage"].update_session(status="failed", error_message=str(e))
+        finally:
+            if os.path.exists(job["temp_file_path"]):
+                os.unlink(job["temp_file_path"])
+            generation_queue.task_done()
+
 
 @app.on_event("startup")
 async def startup_event():
     """Initialize database connection on startup"""
-    await get_async_database()
-    print("✓ FastAPI server started")
-    print("✓ MongoDB connection initialized")
+    global db, generation_queue, _generation_worker_task
+    db = await get_async_database()
+    generation_queue = asyncio.Queue()
+    _generation_worker_task = asyncio.create_task(generation_worker())
+    logger.info("FastAPI server started, MongoDB connection initialized")
+
+    try:
+        await ensure_indexes(db)
+        logger.info("MongoDB indexes ensured")
+    except Exception as e:
+        logger.warning("Could not create indexes: %s", e)
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Close database connection on shutdown"""
+    if _generation_worker_task:
+        _generation_worker_task.cancel()
     await close_async_database()
-    print("✓ MongoDB connection closed")
+    logger.info("MongoDB connection closed")
 
 
 @app.get("/", tags=["Root"])
@@ -88,7 +208,6 @@ async def health_check():
     Verifies API and database connectivity.
     """
     try:
-        db = await get_async_database()
         # Test database connection
         await db.command("ping")
         
@@ -101,13 +220,148 @@ async def health_check():
         raise HTTPException(status_code=503, detail=f"Database connection failed: {str(e)}")
 
 
+def run_generation_pipeline(
+    storage: MCQStorageService,
+    temp_file_path: str,
+    input_filename: str,
+    subject: str,
+    chapter: str,
+    input_type: str,
+    include_explanations: bool,
+    create_session: bool = True
+):
+    """
+    Run the full MCQ generation pipeline and persist results.
+
+    Shared by the buffered, streaming and submit/poll generation
+    endpoints. Creates the session record (unless the caller already did),
+    runs the generator — streaming each assembled MCQ to the storage
+    service's background writer — re-extracts concepts for storage, then
+    saves the rest and marks the session completed.
+
+    Returns:
+        (mcqs, concepts, difficulty_dist, metrics)
+    """
+    llm_provider = DEFAULT_LLM_PROVIDER
+    model = DEFAULT_MODEL
+    batch_size = DEFAULT_BATCH_SIZE
+
+    # Create session record. The caller is holding the connection open for
+    # the whole run, so nothing polls mid-generation - defer the write and
+    # let the completion/failure update_session persist it in one upsert.
+    if create_session:
+        storage.save_session(
+            subject=subject,
+            chapter=chapter,
+            input_filename=input_filename,
+            input_type=input_type,
+            llm_provider=llm_provider,
+            model=model,
+            batch_size=batch_size,
+            status="processing",
+            defer=True
+        )
+
+    logger.info(
+        "API request - session %s: subject=%s chapter=%s file=%s input_type=%s llm=%s/%s batch_size=%s",
+        storage.session_id, subject, chapter, input_filename, input_type,
+        llm_provider, model, batch_size
+    )
+
+    # Initialize MCQ Generator with specified configuration
+    generator = MCQGenerator(
+        llm_provider=llm_provider,
+        model=model,
+        batch_size=batch_size
+    )
+
+    # Generate MCQs (synchronous - waits for completion). Each MCQ is
+    # enqueued for background insertion as the assembler produces it, so
+    # the DB round-trips overlap the concept re-extraction LLM call below
+    # instead of queueing behind it.
+    def _enqueue(mcq):
+        storage.enqueue_mcq(mcq, subject=subject, chapter=chapter)
+
+    mcqs = generator.generate_from_file(
+        input_path=temp_file_path,
+        input_type=input_type,
+        output_path=None,  # We'll handle export separately
+        include_explanations=include_explanations,
+        on_mcq=_enqueue
+    )
+
+    # Get the final state to extract concepts and metrics
+    # We need to re-run just the analyzer to get concepts for storage
+    from state import MCQGeneratorState
+    from nodes.analyzer import content_analyzer_node
+
+    # Create a minimal state to extract concepts; the analyzer reads the
+    # file itself from input_source, so no need to read it again here
+
+    temp_state = MCQGeneratorState(
+        input_source=temp_file_path,
+        input_type=input_type,
+        concepts_queue=[],
+        processed_concept_ids=[],
+        current_batch=[],
+        batch_size=batch_size,
+        generated_stems=[],
+        validated_questions=[],
+        questions_with_distractors=[],
+        final_mcqs=[],
+        needs_more_batches=False,
+        validation_failures=[],
+        config={
+            "llm_provider": llm_provider,
+            "model": model,
+        },
+        metrics={}
+    )
+
+    # Extract concepts
+    analyzer_result = content_analyzer_node(temp_state)
+    concepts = analyzer_result.get("current_batch", []) + analyzer_result.get("concepts_queue", [])
+
+    # Calculate metrics (Counter does the tally in one C-level pass)
+    difficulty_dist = dict(Counter(mcq['metadata']['difficulty'] for mcq in mcqs))
+
+    metrics = {
+        "total_concepts_extracted": len(concepts),
+        "total_mcqs_generated": len(mcqs),
+        "validation_rate": 1.0,  # Since validator is pass-through
+        "difficulty_distribution": difficulty_dist
+    }
+
+    # MCQs were streamed to the background writer; wait for the last
+    # batch to land before callers read them back by session_id
+    storage.flush()
+
+    # Persist concepts and the completed session in one commit (the MCQ
+    # rows are already in)
+    storage.save_all(
+        concepts,
+        [],
+        subject=subject,
+        chapter=chapter,
+        total_concepts=len(concepts),
+        total_mcqs=len(mcqs),
+        difficulty_dist=difficulty_dist,
+        metrics=metrics,
+        status="completed"
+    )
+
+    return mcqs, concepts, difficulty_dist, metrics
+
+
 @app.post("/generate-mcqs", response_model=GenerateMCQResponse, tags=["Generation"])
 async def generate_mcqs(
+    request: Request,
     file: UploadFile = File(..., description="Input file (chapter.md or existing MCQs)"),
     subject: str = Form(..., description="Subject name (e.g., 'Calculus', 'Linear Algebra')"),
     chapter: str = Form(..., description="Chapter name (e.g., 'Chapter 3 - Definite Integrals')"),
     input_type: str = Form("chapter", description="Type of input: 'chapter' or 'mcqs'"),
-    include_explanations: bool = Form(True, description="Include explanations in MCQs")
+    include_explanations: bool = Form(True, description="Include explanations in MCQs"),
+    include_markdown: bool = Form(False, description="Include rendered markdown in the response")
 ):
     """
     Generate MCQs from uploaded file.
@@ -131,14 +385,22 @@ async def generate_mcqs(
     # Validate file type
     if not file.filename.endswith('.md'):
         raise HTTPException(status_code=400, detail="File must be a markdown (.md) file")
-    
+
+    # Fast-reject oversized uploads before reading any of the body
+    content_length = int(request.headers.get("content-length", 0))
+    if content_length > MAX_UPLOAD_BYTES:
+        raise HTTPException(
+            status_code=413,
+            detail=f"File too large: max upload size is {MAX_UPLOAD_BYTES} bytes"
+        )
+
     # Use configuration from environment variables
     llm_provider = DEFAULT_LLM_PROVIDER
     model = DEFAULT_MODEL
     batch_size = DEFAULT_BATCH_SIZE
     
     # Generate unique session ID
-    session_id = str(uuid.uuid4())
+    session_id = str(ObjectId())
     
     # Initialize storage service
     storage = MCQStorageService(session_id=session_id)
@@ -147,136 +409,51 @@ async def generate_mcqs(
     temp_file_path = None
     
     try:
-        # Save uploaded file to temporary location
+        # Save uploaded file to temporary location, streaming in chunks and
+        # enforcing the size cap (Content-Length can be absent or wrong)
+        total_bytes = 0
         with tempfile.NamedTemporaryFile(mode='wb', delete=False, suffix='.md') as temp_file:
-            content = await file.read()
-            temp_file.write(content)
             temp_file_path = temp_file.name
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                total_bytes += len(chunk)
+                if total_bytes > MAX_UPLOAD_BYTES:
+                    raise HTTPException(
+                        status_code=413,
+                        detail=f"File too large: max upload size is {MAX_UPLOAD_BYTES} bytes"
+                    )
+                temp_file.write(chunk)
         
-        # Create session record in database
-        storage.save_session(
+        # Run the full generation + storage pipeline
+        mcqs, concepts, difficulty_dist, metrics = run_generation_pipeline(
+            storage=storage,
+            temp_file_path=temp_file_path,
+            input_filename=file.filename,
             subject=subject,
             chapter=chapter,
-            input_filename=file.filename,
             input_type=input_type,
-            llm_provider=llm_provider,
-            model=model,
-            batch_size=batch_size,
-            status="processing"
-        )
-        
-        print(f"\n{'='*60}")
-        print(f"API REQUEST - Session ID: {session_id}")
-        print(f"{'='*60}")
-        print(f"Subject: {subject}")
-        print(f"Chapter: {chapter}")
-        print(f"File: {file.filename}")
-        print(f"Input Type: {input_type}")
-        print(f"LLM: {llm_provider} - {model}")
-        print(f"Batch Size: {batch_size}")
-        print(f"{'='*60}\n")
-        
-        # Initialize MCQ Generator with specified configuration
-        generator = MCQGenerator(
-            llm_provider=llm_provider,
-            model=model,
-            batch_size=batch_size
-        )
-        
-        # Generate MCQs (synchronous - waits for completion)
-        mcqs = generator.generate_from_file(
-            input_path=temp_file_path,
-            input_type=input_type,
-            output_path=None,  # We'll handle export separately
             include_explanations=include_explanations
         )
-        
-        # Get the final state to extract concepts and metrics
-        # We need to re-run just the analyzer to get concepts for storage
-        from state import MCQGeneratorState
-        from nodes.analyzer import content_analyzer_node
-        from langchain_google_genai import ChatGoogleGenerativeAI
-        from langchain_anthropic import ChatAnthropic
-        from langchain_openai import ChatOpenAI
-        
-        # Read file content for concept extraction
-        with open(temp_file_path, 'r', encoding='utf-8') as f:
-            file_content = f.read()
-        
-        # Create a minimal state to extract concepts
-        temp_state = MCQGeneratorState(
-            input_source=temp_file_path,
-            input_type=input_type,
-            concepts_queue=[],
-            processed_concept_ids=[],
-            current_batch=[],
-            batch_size=batch_size,
-            generated_stems=[],
-            validated_questions=[],
-            questions_with_distractors=[],
-            final_mcqs=[],
-            needs_more_batches=False,
-            validation_failures=[],
-            config={
-                "llm_provider": llm_provider,
-                "model": model,
-            },
-            metrics={}
-        )
-        
-        # Extract concepts
-        analyzer_result = content_analyzer_node(temp_state)
-        concepts = analyzer_result.get("current_batch", []) + analyzer_result.get("concepts_queue", [])
-        
-        # Save concepts to database, chapter=chapter
-        if concepts:
-            storage.save_concepts(concepts, subject=subject, chapter=chapter)
-        
-        # Save MCQs to database
-        storage.save_mcqs(mcqs, subject=subject, chapter=chapter)
-        
-        # Calculate metrics
-        difficulty_dist = {}
-        for mcq in mcqs:
-            diff = mcq['metadata']['difficulty']
-            difficulty_dist[diff] = difficulty_dist.get(diff, 0) + 1
-        
-        metrics = {
-            "total_concepts_extracted": len(concepts),
-            "total_mcqs_generated": len(mcqs),
-            "validation_rate": 1.0,  # Since validator is pass-through
-            "difficulty_distribution": difficulty_dist
-        }
-        
-        # Update session with completion status
-        storage.update_session(
-            total_concepts=len(concepts),
-            total_mcqs=len(mcqs),
-            difficulty_dist=difficulty_dist,
-            metrics=metrics,
-            status="completed"
-        )
-        
-        # Generate markdown content
-        markdown_output = []
-        markdown_output.append(f"### Generated MCQs: Integration")
-        markdown_output.append(f"#### PRACTICE EXERCISE")
-        markdown_output.append(f"")
-        
-        from nodes.assembler import format_mcq_markdown
-        for mcq in mcqs:
-            mcq_text = format_mcq_markdown(mcq, include_explanations)
-            markdown_output.append(mcq_text)
-        
-        markdown_content = "\n".join(markdown_output)
-        
+
+        # Generate markdown content only when requested; the formatting is
+        # CPU-bound string work, so run it off the event loop
+        markdown_content = None
+        if include_markdown:
+            from nodes.assembler import format_mcq_markdown
+
+            def build_markdown():
+                return "\n".join(
+                    ["### Generated MCQs: Integration", "#### PRACTICE EXERCISE", ""]
+                    + [format_mcq_markdown(mcq, include_explanations) for mcq in mcqs]
+                )
+
+            markdown_content = await asyncio.to_thread(build_markdown)
+
         # Convert MCQs to response format
         mcq_responses = []
-        db = await get_async_database()
-        
+
         # Fetch saved MCQs from database to get their IDs
         saved_mcqs = await db[COLLECTIONS["mcqs"]].find(
-            {"session_id": session_id}
+            {"session_id": session_id}, MCQ_PROJECTION
         ).to_list(length=None)
         
         for saved_mcq in saved_mcqs:
@@ -295,12 +472,7 @@ async def generate_mcqs(
                 created_at=saved_mcq["created_at"]
             ))
         
-        print(f"\n{'='*60}")
-        print(f"✓ Generation completed successfully!")
-        print(f"✓ Session ID: {session_id}")
-        print(f"✓ MCQs generated: {len(mcqs)}")
-        print(f"✓ Saved to MongoDB Atlas")
-        print(f"{'='*60}\n")
+        logger.info("Session %s: generation completed, %s MCQs saved", session_id, len(mcqs))
         
         return GenerateMCQResponse(
             session_id=session_id,
@@ -312,6 +484,10 @@ async def generate_mcqs(
             markdown_content=markdown_content
         )
     
+    except HTTPException:
+        # Re-raise client errors (e.g. 413 mid-stream) without masking as 500
+        raise
+
     except Exception as e:
         # Update session with error status
         storage.update_session(
@@ -319,11 +495,7 @@ async def generate_mcqs(
             error_message=str(e)
         )
         
-        print(f"\n{'='*60}")
-        print(f"✗ Generation failed!")
-        print(f"✗ Session ID: {session_id}")
-        print(f"✗ Error: {str(e)}")
-        print(f"{'='*60}\n")
+        logger.exception("Session %s: generation failed", session_id)
         
         raise HTTPException(status_code=500, detail=f"MCQ generation failed: {str(e)}")
     
@@ -333,6 +505,186 @@ async def generate_mcqs(
             os.unlink(temp_file_path)
 
 
+@app.post("/generate-mcqs/submit", status_code=202, tags=["Generation"])
+async def submit_generate_mcqs(
+    request: Request,
+    file: UploadFile = File(..., description="Input file (chapter.md or existing MCQs)"),
+    subject: str = Form(..., description="Subject name (e.g., 'Calculus', 'Linear Algebra')"),
+    chapter: str = Form(..., description="Chapter name (e.g., 'Chapter 3 - Definite Integrals')"),
+    input_type: str = Form("chapter", description="Type of input: 'chapter' or 'mcqs'"),
+    include_explanations: bool = Form(True, description="Include explanations in MCQs")
+):
+    """
+    Submit an MCQ generation job and return immediately with 202.
+
+    The job runs in a background worker; poll GET /sessions/{session_id}
+    for progress and fetch results from GET /mcqs?session_id=... once the
+    session status is "completed". This avoids holding an HTTP socket
+    open for a multi-minute generation run.
+    """
+
+    # Validate input_type
+    if input_type not in ["chapter", "mcqs"]:
+        raise HTTPException(status_code=400, detail="input_type must be 'chapter' or 'mcqs'")
+
+    # Validate file type
+    if not file.filename.endswith('.md'):
+        raise HTTPException(status_code=400, detail="File must be a markdown (.md) file")
+
+    # Fast-reject oversized uploads before reading any of the body
+    content_length = int(request.headers.get("content-length", 0))
+    if content_length > MAX_UPLOAD_BYTES:
+        raise HTTPException(
+            status_code=413,
+            detail=f"File too large: max upload size is {MAX_UPLOAD_BYTES} bytes"
+        )
+
+    session_id = str(ObjectId())
+    storage = MCQStorageService(session_id=session_id)
+
+    # Save uploaded file to temporary location
+    total_bytes = 0
+    with tempfile.NamedTemporaryFile(mode='wb', delete=False, suffix='.md') as temp_file:
+        temp_file_path = temp_file.name
+        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+            total_bytes += len(chunk)
+            if total_bytes > MAX_UPLOAD_BYTES:
+                os.unlink(temp_file_path)
+                raise HTTPException(
+                    status_code=413,
+                    detail=f"File too large: max upload size is {MAX_UPLOAD_BYTES} bytes"
+                )
+            temp_file.write(chunk)
+
+    # Create the session record now so polling works before the worker
+    # picks the job up
+    storage.save_session(
+        subject=subject,
+        chapter=chapter,
+        input_filename=file.filename,
+        input_type=input_type,
+        llm_provider=DEFAULT_LLM_PROVIDER,
+        model=DEFAULT_MODEL,
+        batch_size=DEFAULT_BATCH_SIZE,
+        status="processing"
+    )
+
+    await generation_queue.put({
+        "storage": storage,
+        "temp_file_path": temp_file_path,
+        "input_filename": file.filename,
+        "subject": subject,
+        "chapter": chapter,
+        "input_type": input_type,
+        "include_explanations": include_explanations
+    })
+
+    return {
+        "session_id": session_id,
+        "message": "Generation job accepted",
+        "status": "processing",
+        "poll_url": f"/sessions/{session_id}"
+    }
+
+
+@app.post("/generate-mcqs/stream", tags=["Generation"])
+async def generate_mcqs_stream(
+    request: Request,
+    file: UploadFile = File(..., description="Input file (chapter.md or existing MCQs)"),
+    subject: str = Form(..., description="Subject name (e.g., 'Calculus', 'Linear Algebra')"),
+    chapter: str = Form(..., description="Chapter name (e.g., 'Chapter 3 - Definite Integrals')"),
+    input_type: str = Form("chapter", description="Type of input: 'chapter' or 'mcqs'"),
+    include_explanations: bool = Form(True, description="Include explanations in MCQs")
+):
+    """
+    Generate MCQs and stream them back incrementally as NDJSON.
+
+    Runs the same pipeline as /generate-mcqs but emits one JSON line per
+    MCQ as it is read back from the database, followed by a final summary
+    line with the session ID and metrics. The response is never buffered
+    in full on the server, and generation runs in a worker thread so the
+    event loop stays free.
+    """
+
+    # Validate input_type
+    if input_type not in ["chapter", "mcqs"]:
+        raise HTTPException(status_code=400, detail="input_type must be 'chapter' or 'mcqs'")
+
+    # Validate file type
+    if not file.filename.endswith('.md'):
+        raise HTTPException(status_code=400, detail="File must be a markdown (.md) file")
+
+    # Fast-reject oversized uploads before reading any of the body
+    content_length = int(request.headers.get("content-length", 0))
+    if content_length > MAX_UPLOAD_BYTES:
+        raise HTTPException(
+            status_code=413,
+            detail=f"File too large: max upload size is {MAX_UPLOAD_BYTES} bytes"
+        )
+
+    session_id = str(ObjectId())
+    storage = MCQStorageService(session_id=session_id)
+    input_filename = file.filename
+
+    # Save uploaded file to temporary location before streaming starts
+    total_bytes = 0
+    with tempfile.NamedTemporaryFile(mode='wb', delete=False, suffix='.md') as temp_file:
+        temp_file_path = temp_file.name
+        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+            total_bytes += len(chunk)
+            if total_bytes > MAX_UPLOAD_BYTES:
+                os.unlink(temp_file_path)
+                raise HTTPException(
+                    status_code=413,
+                    detail=f"File too large: max upload size is {MAX_UPLOAD_BYTES} bytes"
+                )
+            temp_file.write(chunk)
+
+    async def stream():
+        try:
+            # Run the blocking pipeline off the event loop
+            mcqs, concepts, difficulty_dist, metrics = await asyncio.to_thread(
+                run_generation_pipeline,
+                storage,
+                temp_file_path,
+                input_filename,
+                subject,
+                chapter,
+                input_type,
+                include_explanations
+            )
+
+            # Stream saved MCQs one NDJSON line at a time
+            cursor = db[COLLECTIONS["mcqs"]].find(
+                {"session_id": session_id}, MCQ_PROJECTION
+            ).sort("question_number", 1)
+
+            async for saved_mcq in cursor:
+                saved_mcq["id"] = str(saved_mcq.pop("_id"))
+                saved_mcq["created_at"] = saved_mcq["created_at"].isoformat()
+                yield json.dumps({"mcq": saved_mcq}) + "\n"
+
+            # Final summary line
+            yield json.dumps({
+                "session_id": session_id,
+                "message": "MCQs generated successfully",
+                "total_mcqs_generated": len(mcqs),
+                "difficulty_distribution": difficulty_dist,
+                "metrics": metrics
+            }) + "\n"
+
+        except Exception as e:
+            storage.update_session(status="failed", error_message=str(e))
+            yield json.dumps({"session_id": session_id, "error": str(e)}) + "\n"
+
+        finally:
+            # Clean up temporary file
+            if temp_file_path and os.path.exists(temp_file_path):
+                os.unlink(temp_file_path)
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
 @app.get("/sessions", response_model=SessionListResponse, tags=["Sessions"])
 async def list_sessions(
     subject: Optional[str] = Query(None, description="Filter by subject"),
@@ -345,8 +697,6 @@ async def list_sessions(
     
     Optionally filter by subject and/or chapter. Returns paginated list of sessions with metadata.
     """
-    db = await get_async_database()
-    
     # Build query filter
     query_filter = {}
     if subject:
@@ -358,7 +708,7 @@ async def list_sessions(
     total = await db[COLLECTIONS["mcq_sessions"]].count_documents(query_filter)
     
     # Fetch sessions
-    sessions = await db[COLLECTIONS["mcq_sessions"]].find(query_filter)\
+    sessions = await db[COLLECTIONS["mcq_sessions"]].find(query_filter, SESSION_PROJECTION)\
         .sort("created_at", -1)\
         .skip(skip)\
         .limit(limit)\
@@ -394,9 +744,9 @@ async def get_session(session_id: str):
     """
     Get details of a specific MCQ generation session.
     """
-    db = await get_async_database()
-    
-    session = await db[COLLECTIONS["mcq_sessions"]].find_one({"session_id": session_id})
+    session = await db[COLLECTIONS["mcq_sessions"]].find_one(
+        {"session_id": session_id}, SESSION_PROJECTION
+    )
         
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
@@ -433,8 +783,6 @@ async def list_mcqs(
     
     Optionally filter by subject, chapter, session ID, and/or difficulty.
     """
-    db = await get_async_database()
-    
     # Build query filter
     query_filter = {}
     if subject:
@@ -450,7 +798,7 @@ async def list_mcqs(
     total = await db[COLLECTIONS["mcqs"]].count_documents(query_filter)
     
     # Fetch MCQs
-    mcqs = await db[COLLECTIONS["mcqs"]].find(query_filter)\
+    mcqs = await db[COLLECTIONS["mcqs"]].find(query_filter, MCQ_PROJECTION)\
         .sort("question_number", 1)\
         .skip(skip)\
         .limit(limit)\
@@ -486,8 +834,6 @@ async def list_subjects():
     
     Returns a list of subjects with their MCQ counts.
     """
-    db = await get_async_database()
-    
     # Get distinct subjects from sessions collection
     subjects = await db[COLLECTIONS["mcq_sessions"]].distinct("subject")
     
@@ -517,11 +863,9 @@ async def get_mcq(mcq_id: str):
     Get details of a specific MCQ.
     """
     from bson import ObjectId
-    
-    db = await get_async_database()
-    
+
     try:
-        mcq = await db[COLLECTIONS["mcqs"]].find_one({"_id": ObjectId(mcq_id)})
+        mcq = await db[COLLECTIONS["mcqs"]].find_one({"_id": ObjectId(mcq_id)}, MCQ_PROJECTION)
     except:
         raise HTTPException(status_code=400, detail="Invalid MCQ ID format")
     
@@ -546,10 +890,17 @@ async def get_mcq(mcq_id: str):
 
 if __name__ == "__main__":
     import uvicorn
-    
+
+    # DEV=1 enables auto-reload (single worker); otherwise run multiple
+    # workers with the faster uvloop/httptools backends
+    dev_mode = os.getenv("DEV", "0") == "1"
+
     uvicorn.run(
         "server:app",
         host="0.0.0.0",
         port=8000,
-        reload=True
+        reload=dev_mode,
+        workers=1 if dev_mode else int(os.getenv("WEB_CONCURRENCY", (os.cpu_count() or 1) * 2 + 1)),
+        loop="uvloop",
+        http="httptools"
     )
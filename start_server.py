@@ -80,21 +80,34 @@ def start_server():
     print("\n" + "="*60)
     print("Starting MCQ Generator API Server...")
     print("="*60)
-    
+
     import uvicorn
-    
+
+    # DEV=1 enables auto-reload (which forces a single worker).
+    # Otherwise run multiple workers sized from WEB_CONCURRENCY so
+    # IO-bound endpoints scale across processes.
+    dev_mode = os.getenv("DEV", "0") == "1"
+    workers = int(os.getenv("WEB_CONCURRENCY", (os.cpu_count() or 1) * 2 + 1))
+
     print("\nServer will be available at:")
     print("  - API: http://localhost:8000")
     print("  - Docs: http://localhost:8000/docs")
     print("  - ReDoc: http://localhost:8000/redoc")
+    if dev_mode:
+        print("\nMode: development (auto-reload, single worker)")
+    else:
+        print(f"\nMode: production ({workers} workers)")
     print("\nPress Ctrl+C to stop the server")
     print("="*60 + "\n")
-    
+
     uvicorn.run(
         "server:app",
         host="0.0.0.0",
         port=8000,
-        reload=True
+        reload=dev_mode,
+        workers=1 if dev_mode else workers,
+        loop="uvloop",
+        http="httptools"
     )
 
 
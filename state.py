@@ -3,6 +3,14 @@ State Schema for LangGraph MCQ Generator
 
 Defines the typed state that flows through the graph nodes with batch processing
 and loopback logic for concept-by-concept MCQ generation.
+
+Note on representation: these types are deliberately TypedDicts rather than
+dataclasses or pydantic models. At runtime they are plain dicts with no
+validation overhead, which is what LangGraph's state-merge semantics, the
+nodes' dict-unpacking (e.g. {**question, 'distractors': ...}) and MongoDB's
+BSON encoding all expect. Converting them to slotted objects would force a
+dict round-trip at every one of those boundaries and cost more than the
+attribute-access savings.
 """
 
 from typing import TypedDict, List, Optional, Literal
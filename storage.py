@@ -5,12 +5,77 @@ Handles saving MCQ generation data to MongoDB Atlas without modifying
 the existing MCQGenerator workflow.
 """
 
-import uuid
+import time
+import queue
+import threading
 from datetime import datetime
+from operator import itemgetter
 from typing import List, Dict
+import bson
+from bson.raw_bson import RawBSONDocument
+from pymongo import InsertOne, ReplaceOne, WriteConcern
+from pymongo.errors import PyMongoError
+from pymongo.errors import BulkWriteError
 from database import get_sync_database, COLLECTIONS
 from state import CompleteMCQ, ConceptJSON
 
+# Batch size for insert_many calls. Throughput on small documents peaks
+# around 50-100 docs per batch; larger single batches just grow the OP_MSG
+# payload and client-side memory without getting faster.
+INSERT_BATCH_SIZE = 100
+
+# How long the background writer waits to accumulate a batch before
+# flushing whatever it has (seconds)
+WRITER_FLUSH_INTERVAL = 0.5
+
+# Fields copied verbatim from pipeline dicts into stored docs. itemgetter
+# fetches the whole tuple in one C-level call instead of a Python
+# subscript per field. (worked_example is optional on concepts, so it is
+# handled separately with .get.)
+_MCQ_FIELDS = (
+    "question_number", "concept_id", "stem", "options",
+    "correct_answer", "explanation", "metadata"
+)
+_mcq_get = itemgetter(*_MCQ_FIELDS)
+
+_CONCEPT_FIELDS = (
+    "concept_id", "concept_name", "formula", "difficulty",
+    "prerequisites", "context"
+)
+_concept_get = itemgetter(*_CONCEPT_FIELDS)
+
+# Cap each insert message at ~1 MB of BSON. Explanation-heavy MCQs can
+# run to dozens of KB apiece, so a count-only batch size can still
+# produce oversized OP_MSG frames the server has to fragment.
+INSERT_TARGET_BYTES = 1_000_000
+
+
+def _chunks_by_size(docs, target_bytes=INSERT_TARGET_BYTES):
+    """
+    Split docs into chunks bounded by both INSERT_BATCH_SIZE documents
+    and ~target_bytes of encoded BSON per chunk.
+
+    Docs are encoded here, once, and yielded as RawBSONDocument: the
+    driver sends raw documents byte-for-byte, so the sizing pass doubles
+    as the insert encoding instead of repeating it inside bulk_write.
+
+    Yields:
+        Lists of RawBSONDocument sized for one insert message
+    """
+    buf = []
+    size = 0
+    for doc in docs:
+        raw = RawBSONDocument(bson.encode(doc))
+        doc_size = len(raw.raw)
+        if buf and (size + doc_size > target_bytes or len(buf) >= INSERT_BATCH_SIZE):
+            yield buf
+            buf = []
+            size = 0
+        buf.append(raw)
+        size += doc_size
+    if buf:
+        yield buf
+
 
 class MCQStorageService:
     """
@@ -25,8 +90,34 @@ class MCQStorageService:
         Args:
             session_id: Unique identifier for this generation session
         """
-        self.session_id = session_id or str(uuid.uuid4())
+        # ObjectId rather than uuid4: generated from a counter + timestamp
+        # with no urandom syscall, 12 bytes instead of 36 chars, and its
+        # monotonic prefix keeps the session_id index B-tree compact
+        self.session_id = session_id or str(bson.ObjectId())
         self.db = get_sync_database()
+        # Local copy of the session document, kept so update_session can
+        # write the merged doc in one upsert instead of insert + update
+        self._session_doc = None
+        # Last status written, so repeated status-only updates (e.g.
+        # "processing" progress ticks) skip the round-trip entirely
+        self._last_status = None
+        # MCQ/concept inserts are append-only bulk data: a single-node ack
+        # without journal fsync is enough, and much faster than the Atlas
+        # default w=majority. Session writes keep the default concern.
+        _fast_concern = WriteConcern(w=1, j=False)
+        self._fast_mcqs = self.db.get_collection(
+            COLLECTIONS["mcqs"], write_concern=_fast_concern
+        )
+        self._fast_concepts = self.db.get_collection(
+            COLLECTIONS["concepts"], write_concern=_fast_concern
+        )
+        # Cached session collection handle; Database.__getitem__ builds a
+        # new Collection object on every subscript otherwise
+        self._sessions = self.db[COLLECTIONS["mcq_sessions"]]
+        # Background writer, started lazily on first enqueue_mcq call so
+        # DB writes overlap LLM latency instead of waiting for end of run
+        self._write_queue = None
+        self._writer_thread = None
     
     def save_session(
         self,
@@ -37,11 +128,12 @@ class MCQStorageService:
         llm_provider: str,
         model: str,
         batch_size: int,
-        status: str = "processing"
+        status: str = "processing",
+        defer: bool = False
     ) -> str:
         """
         Create a new session record in MongoDB.
-        
+
         Args:
             subject: Subject name (e.g., "Calculus")
             chapter: Chapter name (e.g., "Chapter 3 - Definite Integrals")
@@ -51,11 +143,17 @@ class MCQStorageService:
             model: Model name used
             batch_size: Batch size used
             status: Session status
-        
+            defer: Skip the immediate write; the session doc is written by
+                the next update_session call instead. Use when nothing
+                polls the session mid-run, to halve session round-trips.
+
         Returns:
             Session ID
         """
         session_doc = {
+            # Reuse the session id as _id so the server doesn't allocate a
+            # separate ObjectId per session document
+            "_id": self.session_id,
             "session_id": self.session_id,
             "subject": subject,
             "chapter": chapter,
@@ -75,13 +173,34 @@ class MCQStorageService:
             "completed_at": None
         }
         
-        self.db[COLLECTIONS["mcq_sessions"]].insert_one(session_doc)
+        self._session_doc = session_doc
+        self._last_status = status
+        if not defer:
+            # Upsert rather than insert so retried requests don't raise on
+            # a duplicate session_id
+            self._sessions.replace_one(
+                {"session_id": self.session_id}, session_doc, upsert=True
+            )
         return self.session_id
     
+    def _build_concept_docs(self, concepts: List[ConceptJSON], subject: str, chapter: str, now: datetime) -> List[Dict]:
+        """Project concept dicts into their stored document shape"""
+        return [
+            dict(
+                zip(_CONCEPT_FIELDS, _concept_get(concept)),
+                worked_example=concept.get("worked_example"),
+                session_id=self.session_id,
+                subject=subject,
+                chapter=chapter,
+                created_at=now
+            )
+            for concept in concepts
+        ]
+
     def save_concepts(self, concepts: List[ConceptJSON], subject: str, chapter: str):
         """
         Save extracted concepts to MongoDB.
-        
+
         Args:
             concepts: List of ConceptJSON objects
             subject: Subject name
@@ -89,30 +208,42 @@ class MCQStorageService:
         """
         if not concepts:
             return
-        
-        concept_docs = []
-        for concept in concepts:
-            doc = {
-                "concept_id": concept["concept_id"],
-                "concept_name": concept["concept_name"],
-                "formula": concept["formula"],
-                "difficulty": concept["difficulty"],
-                "prerequisites": concept["prerequisites"],
-                "context": concept["context"],
-                "worked_example": concept.get("worked_example"),
-                "session_id": self.session_id,
-                "subject": subject,
-                "chapter": chapter,
-                "created_at": datetime.utcnow()
-            }
-            concept_docs.append(doc)
-        
-        self.db[COLLECTIONS["concepts"]].insert_many(concept_docs)
+
+        # One timestamp per batch - all docs share the same insert time
+        concept_docs = self._build_concept_docs(concepts, subject, chapter, datetime.utcnow())
+
+        # Insert in tuned batches; unordered lets the server parallelize
+        # and keep going past individual document failures. Chunks arrive
+        # pre-encoded as RawBSONDocument, so each doc is BSON-encoded
+        # exactly once — in the sizing pass.
+        collection = self._fast_concepts
+        for chunk in _chunks_by_size(concept_docs):
+            try:
+                collection.bulk_write(
+                    [InsertOne(doc) for doc in chunk],
+                    ordered=False
+                )
+            except BulkWriteError as e:
+                for error in e.details.get("writeErrors", []):
+                    print(f"⚠ Concept insert failed (index {error.get('index')}): {error.get('errmsg')}")
     
+    def _build_mcq_docs(self, mcqs: List[CompleteMCQ], subject: str, chapter: str, now: datetime) -> List[Dict]:
+        """Project MCQ dicts into their stored document shape"""
+        return [
+            dict(
+                zip(_MCQ_FIELDS, _mcq_get(mcq)),
+                session_id=self.session_id,
+                subject=subject,
+                chapter=chapter,
+                created_at=now
+            )
+            for mcq in mcqs
+        ]
+
     def save_mcqs(self, mcqs: List[CompleteMCQ], subject: str, chapter: str):
         """
         Save generated MCQs to MongoDB.
-        
+
         Args:
             mcqs: List of CompleteMCQ objects
             subject: Subject name
@@ -120,48 +251,91 @@ class MCQStorageService:
         """
         if not mcqs:
             return
-        
-        mcq_docs = []
-        for mcq in mcqs:
-            doc = {
-                "session_id": self.session_id,
-                "subject": subject,
-                "chapter": chapter,
-                "question_number": mcq["question_number"],
-                "concept_id": mcq["concept_id"],
-                "stem": mcq["stem"],
-                "options": mcq["options"],
-                "correct_answer": mcq["correct_answer"],
-                "explanation": mcq["explanation"],
-                "metadata": mcq["metadata"],
-                "created_at": datetime.utcnow()
-            }
-            mcq_docs.append(doc)
-        
-        self.db[COLLECTIONS["mcqs"]].insert_many(mcq_docs)
+
+        # One timestamp per batch - all docs share the same insert time
+        mcq_docs = self._build_mcq_docs(mcqs, subject, chapter, datetime.utcnow())
+
+        # Insert in tuned batches; unordered lets the server parallelize
+        # and keep going past individual document failures. Chunks arrive
+        # pre-encoded as RawBSONDocument, so each doc is BSON-encoded
+        # exactly once — in the sizing pass.
+        collection = self._fast_mcqs
+        for chunk in _chunks_by_size(mcq_docs):
+            try:
+                collection.bulk_write(
+                    [InsertOne(doc) for doc in chunk],
+                    ordered=False
+                )
+            except BulkWriteError as e:
+                for error in e.details.get("writeErrors", []):
+                    print(f"⚠ MCQ insert failed (index {error.get('index')}): {error.get('errmsg')}")
     
-    def update_session(
-        self,
+    def enqueue_mcq(self, mcq: CompleteMCQ, subject: str, chapter: str):
+        """
+        Queue one MCQ for background insertion.
+
+        Alternative to the end-of-run save_mcqs call: MCQs enqueued as
+        they come out of the pipeline are written by a daemon thread in
+        INSERT_BATCH_SIZE batches, so the DB round-trips run while the
+        pipeline is waiting on the next LLM response. Call flush() before
+        reading the MCQs back.
+
+        Args:
+            mcq: CompleteMCQ object
+            subject: Subject name
+            chapter: Chapter name
+        """
+        if self._write_queue is None:
+            self._write_queue = queue.Queue()
+            self._writer_thread = threading.Thread(target=self._writer_loop, daemon=True)
+            self._writer_thread.start()
+        self._write_queue.put((mcq, subject, chapter))
+
+    def flush(self):
+        """Block until every enqueued MCQ has been written"""
+        if self._write_queue is not None:
+            self._write_queue.join()
+
+    def _writer_loop(self):
+        """Drain the queue in batches of up to INSERT_BATCH_SIZE items,
+        flushing whatever accumulated after WRITER_FLUSH_INTERVAL"""
+        while True:
+            batch = [self._write_queue.get()]
+            deadline = time.monotonic() + WRITER_FLUSH_INTERVAL
+            while len(batch) < INSERT_BATCH_SIZE:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._write_queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            # Group by (subject, chapter) and reuse the batched insert path
+            groups = {}
+            for mcq, subject, chapter in batch:
+                groups.setdefault((subject, chapter), []).append(mcq)
+            for (subject, chapter), mcqs in groups.items():
+                try:
+                    self.save_mcqs(mcqs, subject=subject, chapter=chapter)
+                except Exception as e:
+                    print(f"⚠ Background MCQ write failed: {e}")
+
+            for _ in batch:
+                self._write_queue.task_done()
+
+    @staticmethod
+    def _build_session_update(
         total_concepts: int = None,
         total_mcqs: int = None,
         difficulty_dist: Dict[str, int] = None,
         metrics: Dict = None,
         status: str = None,
         error_message: str = None
-    ):
-        """
-        Update session with final metrics and status.
-        
-        Args:
-            total_concepts: Total concepts extracted
-            total_mcqs: Total MCQs generated
-            difficulty_dist: Difficulty distribution
-            metrics: Generation metrics
-            status: Session status
-            error_message: Error message if failed
-        """
+    ) -> Dict:
+        """Build the $set document for a session update"""
         update_doc = {}
-        
+
         if total_concepts is not None:
             update_doc["total_concepts_extracted"] = total_concepts
         if total_mcqs is not None:
@@ -177,9 +351,132 @@ class MCQStorageService:
                 update_doc["completed_at"] = datetime.utcnow()
         if error_message is not None:
             update_doc["error_message"] = error_message
-        
-        if update_doc:
-            self.db[COLLECTIONS["mcq_sessions"]].update_one(
+
+        return update_doc
+
+    def update_session(
+        self,
+        total_concepts: int = None,
+        total_mcqs: int = None,
+        difficulty_dist: Dict[str, int] = None,
+        metrics: Dict = None,
+        status: str = None,
+        error_message: str = None
+    ):
+        """
+        Update session with final metrics and status.
+
+        Args:
+            total_concepts: Total concepts extracted
+            total_mcqs: Total MCQs generated
+            difficulty_dist: Difficulty distribution
+            metrics: Generation metrics
+            status: Session status
+            error_message: Error message if failed
+        """
+        # No-op calls return before any dict construction or round-trip
+        if (total_concepts is None and total_mcqs is None
+                and difficulty_dist is None and metrics is None
+                and status is None and error_message is None):
+            return
+
+        # A status-only update repeating the last written status (common
+        # during progress ticks) has nothing new to say - skip the write
+        if (status is not None and status == self._last_status
+                and total_concepts is None and total_mcqs is None
+                and difficulty_dist is None and metrics is None
+                and error_message is None):
+            return
+
+        if status is not None:
+            self._last_status = status
+
+        update_doc = self._build_session_update(
+            total_concepts, total_mcqs, difficulty_dist,
+            metrics, status, error_message
+        )
+
+        if not update_doc:
+            return
+
+        if self._session_doc is not None:
+            # We hold the full session doc locally, so write the merged
+            # version in one upsert - this also covers the deferred
+            # save_session case without a separate insert round-trip
+            self._session_doc.update(update_doc)
+            self._sessions.replace_one(
+                {"session_id": self.session_id}, self._session_doc, upsert=True
+            )
+        else:
+            self._sessions.update_one(
                 {"session_id": self.session_id},
                 {"$set": update_doc}
             )
+
+    def save_all(
+        self,
+        concepts: List[ConceptJSON],
+        mcqs: List[CompleteMCQ],
+        subject: str,
+        chapter: str,
+        **session_update
+    ):
+        """
+        Persist concepts, MCQs and the final session state in one commit.
+
+        Issues one bulk_write per collection inside a single transaction,
+        so the whole generation result lands atomically in as few round
+        trips as the driver allows. Standalone servers (no replica set)
+        don't support transactions, so on failure this falls back to the
+        regular sequential save_concepts/save_mcqs/update_session path.
+
+        Args:
+            concepts: Extracted ConceptJSON objects (may be empty)
+            mcqs: Generated CompleteMCQ objects (may be empty)
+            subject: Subject name
+            chapter: Chapter name
+            **session_update: update_session keyword arguments
+                (total_concepts, total_mcqs, difficulty_dist, metrics,
+                status, error_message)
+        """
+        now = datetime.utcnow()
+        concept_ops = [
+            InsertOne(doc)
+            for doc in self._build_concept_docs(concepts, subject, chapter, now)
+        ]
+        mcq_ops = [
+            InsertOne(doc)
+            for doc in self._build_mcq_docs(mcqs, subject, chapter, now)
+        ]
+
+        update_doc = self._build_session_update(**session_update)
+        if self._session_doc is not None:
+            self._session_doc.update(update_doc)
+            session_doc = self._session_doc
+        else:
+            session_doc = dict(update_doc, _id=self.session_id, session_id=self.session_id)
+        session_ops = [
+            ReplaceOne({"session_id": self.session_id}, session_doc, upsert=True)
+        ]
+
+        try:
+            # Transactions ignore per-collection write concern, so use the
+            # default-concern handles here
+            concepts_coll = self.db[COLLECTIONS["concepts"]]
+            mcqs_coll = self.db[COLLECTIONS["mcqs"]]
+
+            def _commit(txn_session):
+                if concept_ops:
+                    concepts_coll.bulk_write(concept_ops, session=txn_session, ordered=False)
+                if mcq_ops:
+                    mcqs_coll.bulk_write(mcq_ops, session=txn_session, ordered=False)
+                self._sessions.bulk_write(session_ops, session=txn_session, ordered=False)
+
+            with self.db.client.start_session() as txn_session:
+                txn_session.with_transaction(_commit)
+
+        except PyMongoError as e:
+            print(f"⚠ Transactional save unavailable ({e}), falling back to sequential writes")
+            self.save_concepts(concepts, subject=subject, chapter=chapter)
+            self.save_mcqs(mcqs, subject=subject, chapter=chapter)
+            self.update_session(**session_update)
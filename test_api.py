@@ -4,14 +4,32 @@ Test script for MCQ Generator API
 Simple script to test the API endpoints.
 """
 
+import os
 import requests
 import json
 import time
 from pathlib import Path
+from requests.adapters import HTTPAdapter
+
+# Streaming multipart upload avoids buffering the whole chapter file in
+# memory; fall back to the standard encoder if toolbelt isn't installed
+try:
+    from requests_toolbelt import MultipartEncoder
+except ImportError:
+    MultipartEncoder = None
+
+# VERBOSE=1 re-enables pretty-printed JSON response dumps
+VERBOSE = os.getenv("VERBOSE", "0") == "1"
 
 # API base URL
 BASE_URL = "http://localhost:8000"
 
+# Shared session so every test reuses one keep-alive connection instead
+# of paying a fresh TCP/TLS handshake per request
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=10, pool_maxsize=10))
+SESSION.headers["Connection"] = "keep-alive"
+
 
 def test_health():
     """Test health check endpoint"""
@@ -19,11 +37,12 @@ def test_health():
     print("TEST 1: Health Check")
     print("="*60)
     
-    response = requests.get(f"{BASE_URL}/health")
+    response = SESSION.get(f"{BASE_URL}/health")
     
     print(f"Status Code: {response.status_code}")
-    print(f"Response: {json.dumps(response.json(), indent=2)}")
-    
+    if VERBOSE:
+        print(f"Response: {json.dumps(response.json(), indent=2)}")
+
     assert response.status_code == 200, "Health check failed"
     print("✓ Health check passed")
 
@@ -43,22 +62,35 @@ def test_generate_mcqs(test_file_path: str, subject: str = "Test Subject - Calcu
     print(f"Subject: {subject}")
     
     with open(test_file_path, "rb") as f:
-        files = {"file": (Path(test_file_path).name, f, "text/markdown")}
-        data = {
-            "subject": subject,
-            "input_type": "chapter",
-            "include_explanations": True
-        }
-        
         print("Sending request (this may take 2-5 minutes)...")
         start_time = time.time()
-        
-        response = requests.post(
-            f"{BASE_URL}/generate-mcqs",
-            files=files,
-            data=data
-        )
-        
+
+        if MultipartEncoder is not None:
+            # Stream the upload instead of buffering the whole body in RAM
+            encoder = MultipartEncoder(fields={
+                "file": (Path(test_file_path).name, f, "text/markdown"),
+                "subject": subject,
+                "input_type": "chapter",
+                "include_explanations": "true"
+            })
+            response = SESSION.post(
+                f"{BASE_URL}/generate-mcqs",
+                data=encoder,
+                headers={"Content-Type": encoder.content_type}
+            )
+        else:
+            files = {"file": (Path(test_file_path).name, f, "text/markdown")}
+            data = {
+                "subject": subject,
+                "input_type": "chapter",
+                "include_explanations": True
+            }
+            response = SESSION.post(
+                f"{BASE_URL}/generate-mcqs",
+                files=files,
+                data=data
+            )
+
         elapsed = time.time() - start_time
     
     print(f"Status Code: {response.status_code}")
@@ -89,7 +121,7 @@ def test_list_sessions():
     print("TEST 3: List Sessions")
     print("="*60)
     
-    response = requests.get(f"{BASE_URL}/sessions?limit=5")
+    response = SESSION.get(f"{BASE_URL}/sessions?limit=5")
     
     print(f"Status Code: {response.status_code}")
     
@@ -118,7 +150,7 @@ def test_get_session(session_id: str):
         print("⚠ No session ID provided, skipping")
         return
     
-    response = requests.get(f"{BASE_URL}/sessions/{session_id}")
+    response = SESSION.get(f"{BASE_URL}/sessions/{session_id}")
     
     print(f"Status Code: {response.status_code}")
     
@@ -143,7 +175,7 @@ def test_list_subjects():
     print("TEST 4: List Subjects")
     print("="*60)
     
-    response = requests.get(f"{BASE_URL}/subjects")
+    response = SESSION.get(f"{BASE_URL}/subjects")
     
     print(f"Status Code: {response.status_code}")
     
@@ -174,7 +206,7 @@ def test_list_mcqs(session_id: str = None, subject: str = None):
         url += f"&subject={subject}"
         print(f"Filtering by subject: {subject}")
     
-    response = requests.get(url)
+    response = SESSION.get(url)
     
     print(f"Status Code: {response.status_code}")
     
@@ -204,7 +236,7 @@ def test_get_mcq(mcq_id: str):
         print("⚠ No MCQ ID provided, skipping")
         return
     
-    response = requests.get(f"{BASE_URL}/mcqs/{mcq_id}")
+    response = SESSION.get(f"{BASE_URL}/mcqs/{mcq_id}")
     
     print(f"Status Code: {response.status_code}")
     
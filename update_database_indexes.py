@@ -7,8 +7,9 @@ This script:
 3. Creates compound indexes for (subject, chapter)
 """
 
-from pymongo import MongoClient
+from pymongo import IndexModel, MongoClient
 import os
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -36,32 +37,34 @@ def update_indexes():
     print("UPDATING DATABASE INDEXES")
     print(f"{'='*60}\n")
     
-    # Update each collection
-    for collection_name in COLLECTIONS.values():
+    def update_collection(collection_name):
+        """Backfill chapter + build both indexes for one collection."""
         print(f"\n📊 Processing collection: {collection_name}")
         collection = db[collection_name]
-        
+
         # Add default chapter field to existing documents that don't have it
         result = collection.update_many(
             {"chapter": {"$exists": False}},
             {"$set": {"chapter": "Unknown Chapter"}}
         )
-        print(f"  ✓ Updated {result.modified_count} documents with default chapter value")
-        
-        # Create index on chapter field
-        try:
-            collection.create_index("chapter")
-            print(f"  ✓ Created index on 'chapter' field")
-        except Exception as e:
-            print(f"  ⚠ Index on 'chapter' already exists or error: {e}")
-        
-        # Create compound index on (subject, chapter)
+        print(f"  ✓ Updated {result.modified_count} documents with default chapter value ({collection_name})")
+
+        # Build both indexes with a single createIndexes command;
+        # background=True keeps writes flowing during the build
         try:
-            collection.create_index([("subject", 1), ("chapter", 1)])
-            print(f"  ✓ Created compound index on ('subject', 'chapter')")
+            collection.create_indexes([
+                IndexModel("chapter", background=True),
+                IndexModel([("subject", 1), ("chapter", 1)], background=True)
+            ])
+            print(f"  ✓ Created 'chapter' and ('subject', 'chapter') indexes ({collection_name})")
         except Exception as e:
-            print(f"  ⚠ Compound index on ('subject', 'chapter') already exists or error: {e}")
-    
+            print(f"  ⚠ Index creation on {collection_name} failed or already exists: {e}")
+
+    # Collections are independent, so run them in parallel instead of
+    # paying the round-trips sequentially
+    with ThreadPoolExecutor(max_workers=len(COLLECTIONS)) as executor:
+        list(executor.map(update_collection, COLLECTIONS.values()))
+
     print(f"\n{'='*60}")
     print("✅ Database update completed!")
     print(f"{'='*60}\n")
@@ -2,10 +2,24 @@
 Wrapper for Groq API to make it compatible with LangChain interface
 """
 import os
-from groq import Groq
+import asyncio
+from groq import Groq, AsyncGroq
 from typing import List, Dict, Any
 
 
+# One Groq client per process. Each Groq() builds its own httpx client and
+# connection pool, so sharing it keeps TLS sessions and keep-alive
+# connections warm between back-to-back LLM calls.
+_GROQ_CLIENT = None
+
+
+def _get_groq_client(api_key: str) -> Groq:
+    global _GROQ_CLIENT
+    if _GROQ_CLIENT is None:
+        _GROQ_CLIENT = Groq(api_key=api_key)
+    return _GROQ_CLIENT
+
+
 class GroqChatResponse:
     """Mock LangChain response object for Groq"""
     def __init__(self, content: str):
@@ -30,23 +44,13 @@ class ChatGroq:
         if not api_key:
             raise ValueError("GROQ_API_KEY not found in environment variables")
         
-        self.client = Groq(api_key=api_key)
+        self.client = _get_groq_client(api_key)
         self.model = model
         self.temperature = temperature
         self.timeout = 120  # 2 minute timeout for long requests
     
-    def invoke(self, messages: List[Dict[str, str]]) -> GroqChatResponse:
-        """
-        Invoke Groq API with messages (compatible with LangChain interface).
-        
-        Args:
-            messages: List of message dicts with 'role' and 'content' keys
-                     OR a list of LangChain message objects
-        
-        Returns:
-            GroqChatResponse with content attribute
-        """
-        # Convert LangChain message objects to dict format if needed
+    def _format_messages(self, messages: List[Dict[str, str]]) -> List[Dict[str, str]]:
+        """Convert LangChain message objects to Groq dict format if needed"""
         formatted_messages = []
         for msg in messages:
             if hasattr(msg, 'type') and hasattr(msg, 'content'):
@@ -65,7 +69,25 @@ class ChatGroq:
                     "role": "user",
                     "content": str(msg)
                 })
-        
+        return formatted_messages
+
+    def stream_invoke(self, messages: List[Dict[str, str]]):
+        """
+        Invoke Groq API in streaming mode, yielding content chunks.
+
+        Lets callers start processing (JSON scanning, progress display)
+        while later tokens are still in flight instead of waiting for the
+        full 32k-token response.
+
+        Args:
+            messages: List of message dicts with 'role' and 'content' keys
+                     OR a list of LangChain message objects
+
+        Yields:
+            Content fragments (str) as they arrive
+        """
+        formatted_messages = self._format_messages(messages)
+
         # Call Groq API with timeout and retry logic
         try:
             completion = self.client.chat.completions.create(
@@ -74,7 +96,7 @@ class ChatGroq:
                 temperature=self.temperature,
                 max_tokens=32768,  # Increased for large JSON responses
                 top_p=1,
-                stream=False,  # Use non-streaming for compatibility
+                stream=True,
                 stop=None,
                 timeout=self.timeout
             )
@@ -90,15 +112,98 @@ class ChatGroq:
                     temperature=self.temperature,
                     max_tokens=32000,
                     top_p=1,
-                    stream=False,
+                    stream=True,
                     stop=None,
                     timeout=self.timeout
                 )
             else:
                 raise
-        
-        # Extract response content
-        response_content = completion.choices[0].message.content
-        
-        # Return LangChain-compatible response
-        return GroqChatResponse(content=response_content)
+
+        for chunk in completion:
+            content = chunk.choices[0].delta.content
+            if content:
+                yield content
+
+    def invoke(self, messages: List[Dict[str, str]]) -> GroqChatResponse:
+        """
+        Invoke Groq API with messages (compatible with LangChain interface).
+
+        Compatibility shim over stream_invoke: joins the streamed chunks
+        into a single response.
+
+        Args:
+            messages: List of message dicts with 'role' and 'content' keys
+                     OR a list of LangChain message objects
+
+        Returns:
+            GroqChatResponse with content attribute
+        """
+        return GroqChatResponse(content="".join(self.stream_invoke(messages)))
+
+
+class AsyncChatGroq(ChatGroq):
+    """
+    Async variant of ChatGroq for overlapping many LLM calls.
+
+    Sequential stem/distractor generation pays full provider latency per
+    concept; awaiting several ainvoke calls with asyncio.gather runs them
+    concurrently, bounded by max_concurrency to stay under rate limits.
+    """
+
+    # One shared async client per process, same rationale as _GROQ_CLIENT
+    _ASYNC_CLIENT = None
+
+    def __init__(self, model: str, temperature: float = 0.7,
+                 max_concurrency: int = 10, **kwargs):
+        """
+        Initialize async Groq client.
+
+        Args:
+            model: Model name (e.g., "llama-3.3-70b-versatile")
+            temperature: Temperature for generation (0.0 to 2.0)
+            max_concurrency: Cap on simultaneous in-flight requests
+        """
+        super().__init__(model, temperature, **kwargs)
+        if AsyncChatGroq._ASYNC_CLIENT is None:
+            AsyncChatGroq._ASYNC_CLIENT = AsyncGroq(api_key=os.getenv("GROQ_API_KEY"))
+        self.async_client = AsyncChatGroq._ASYNC_CLIENT
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def ainvoke(self, messages: List[Dict[str, str]]) -> GroqChatResponse:
+        """
+        Async invoke, safe to gather: concurrency is bounded by the
+        instance's semaphore.
+
+        Args:
+            messages: List of message dicts or LangChain message objects
+
+        Returns:
+            GroqChatResponse with content attribute
+        """
+        formatted_messages = self._format_messages(messages)
+
+        async with self._semaphore:
+            completion = await self.async_client.chat.completions.create(
+                model=self.model,
+                messages=formatted_messages,
+                temperature=self.temperature,
+                max_tokens=32768,
+                top_p=1,
+                stream=False,
+                stop=None,
+                timeout=self.timeout
+            )
+
+        return GroqChatResponse(content=completion.choices[0].message.content)
+
+    async def ainvoke_many(self, message_lists: List[List[Dict[str, str]]]) -> List[GroqChatResponse]:
+        """
+        Run many invocations concurrently and return responses in order.
+
+        Args:
+            message_lists: One message list per desired completion
+
+        Returns:
+            List of GroqChatResponse, same order as message_lists
+        """
+        return await asyncio.gather(*[self.ainvoke(msgs) for msgs in message_lists])
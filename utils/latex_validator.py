@@ -7,6 +7,19 @@ Checks LaTeX syntax and ensures proper rendering.
 import re
 from typing import Tuple
 
+# Patterns compiled once at import so each validation call is a direct
+# C-level match instead of a per-call pattern lookup
+_FRAC_FULL_RE = re.compile(r'\\frac\s*+\{[^}]*+\}\s*+\{[^}]*+\}')
+_SQRT_FULL_RE = re.compile(r'\\sqrt(\[[^\]]*+\])?+\s*+\{[^}]*+\}')
+_DOUBLE_SUP_RE = re.compile(r'\^\^')
+_DOUBLE_SUB_RE = re.compile(r'__')
+_WHITESPACE_RE = re.compile(r'\s+')
+_BRACE_RE = re.compile(r'[{}]')
+_BRACKET_RE = re.compile(r'[\[\]]')
+# Display before inline in the alternation so $$...$$ isn't picked up
+# as an empty-delimited inline match
+_MD_MATH_RE = re.compile(r'\$\$([^$]+)\$\$|\$([^$]+)\$')
+
 
 def validate_latex_syntax(latex_str: str) -> Tuple[bool, str]:
     """
@@ -23,33 +36,31 @@ def validate_latex_syntax(latex_str: str) -> Tuple[bool, str]:
     
     errors = []
     
-    # Check balanced braces
-    brace_count = 0
-    for i, char in enumerate(latex_str):
-        if char == '{':
-            brace_count += 1
-        elif char == '}':
-            brace_count -= 1
-        if brace_count < 0:
-            errors.append(f"Unmatched closing brace at position {i}")
-            break
-    
-    if brace_count > 0:
-        errors.append(f"Unclosed braces: {brace_count} remaining")
-    
-    # Check balanced brackets
-    bracket_count = 0
-    for i, char in enumerate(latex_str):
-        if char == '[':
-            bracket_count += 1
-        elif char == ']':
-            bracket_count -= 1
-        if bracket_count < 0:
-            errors.append(f"Unmatched closing bracket at position {i}")
-            break
-    
-    if bracket_count > 0:
-        errors.append(f"Unclosed brackets: {bracket_count} remaining")
+    # Check balanced braces. str.count runs at C speed, so expressions
+    # with no braces skip the scan entirely; otherwise walk just the
+    # brace characters (not every char) to locate a closer-before-opener.
+    if latex_str.count('{') or latex_str.count('}'):
+        brace_count = 0
+        for match in _BRACE_RE.finditer(latex_str):
+            brace_count += 1 if match.group() == '{' else -1
+            if brace_count < 0:
+                errors.append(f"Unmatched closing brace at position {match.start()}")
+                break
+
+        if brace_count > 0:
+            errors.append(f"Unclosed braces: {brace_count} remaining")
+
+    # Check balanced brackets, same strategy
+    if latex_str.count('[') or latex_str.count(']'):
+        bracket_count = 0
+        for match in _BRACKET_RE.finditer(latex_str):
+            bracket_count += 1 if match.group() == '[' else -1
+            if bracket_count < 0:
+                errors.append(f"Unmatched closing bracket at position {match.start()}")
+                break
+
+        if bracket_count > 0:
+            errors.append(f"Unclosed brackets: {bracket_count} remaining")
     
     # Check for common LaTeX commands
     common_commands = [
@@ -59,24 +70,21 @@ def validate_latex_syntax(latex_str: str) -> Tuple[bool, str]:
         r'\\leq', r'\\geq', r'\\neq', r'\\approx'
     ]
     
-    # Check for malformed fractions
-    frac_pattern = r'\\frac\s*\{[^}]*\}\s*\{[^}]*\}'
-    fracs = re.findall(r'\\frac', latex_str)
-    valid_fracs = re.findall(frac_pattern, latex_str)
-    if len(fracs) != len(valid_fracs):
+    # Check for malformed fractions. Counting the literal command is a
+    # C-level substring scan; only the well-formed check needs the regex.
+    fracs_count = latex_str.count('\\frac')
+    if fracs_count and fracs_count != len(_FRAC_FULL_RE.findall(latex_str)):
         errors.append("Malformed \\frac command (needs two arguments in braces)")
-    
+
     # Check for malformed sqrt
-    sqrt_pattern = r'\\sqrt(\[[^\]]*\])?\s*\{[^}]*\}'
-    sqrts = re.findall(r'\\sqrt', latex_str)
-    valid_sqrts = re.findall(sqrt_pattern, latex_str)
-    if len(sqrts) != len(valid_sqrts):
+    sqrts_count = latex_str.count('\\sqrt')
+    if sqrts_count and sqrts_count != len(_SQRT_FULL_RE.findall(latex_str)):
         errors.append("Malformed \\sqrt command")
-    
+
     # Check for double superscripts/subscripts without braces
-    if re.search(r'\^\^', latex_str):
+    if _DOUBLE_SUP_RE.search(latex_str):
         errors.append("Double superscript (^^) without braces")
-    if re.search(r'__', latex_str):
+    if _DOUBLE_SUB_RE.search(latex_str):
         errors.append("Double subscript (__) without braces")
     
     if errors:
@@ -97,7 +105,7 @@ def normalize_latex(latex_str: str) -> str:
         return latex_str
     
     # Remove extra spaces
-    normalized = re.sub(r'\s+', ' ', latex_str).strip()
+    normalized = _WHITESPACE_RE.sub(' ', latex_str).strip()
     
     # Standardize arc functions to inverse notation
     normalized = normalized.replace(r'\arcsin', r'\sin^{-1}')
@@ -107,22 +115,34 @@ def normalize_latex(latex_str: str) -> str:
     return normalized
 
 
+def iter_latex_from_markdown(markdown_text: str):
+    """
+    Yield LaTeX expressions from markdown text in document order.
+
+    Lazy counterpart of extract_latex_from_markdown: callers that only
+    need the first expression (next(..., None)) or a mere existence
+    check (any(...)) stop the scan early and never build a list.
+
+    Args:
+        markdown_text: Markdown with inline $ or display $$ LaTeX
+
+    Yields:
+        LaTeX expressions found
+    """
+    # One pass finds both display $$...$$ and inline $...$ math; each
+    # match has exactly one non-empty group
+    for match in _MD_MATH_RE.finditer(markdown_text):
+        yield match.group(1) or match.group(2)
+
+
 def extract_latex_from_markdown(markdown_text: str) -> list[str]:
     """
     Extract all LaTeX expressions from markdown text.
-    
+
     Args:
         markdown_text: Markdown with inline $ or display $$ LaTeX
-    
+
     Returns:
         List of LaTeX expressions found
     """
-    # Find inline math $...$
-    inline_pattern = r'\$([^\$]+)\$'
-    inline_matches = re.findall(inline_pattern, markdown_text)
-    
-    # Find display math $$...$$
-    display_pattern = r'\$\$([^\$]+)\$\$'
-    display_matches = re.findall(display_pattern, markdown_text)
-    
-    return inline_matches + display_matches
+    return list(iter_latex_from_markdown(markdown_text))
@@ -0,0 +1,89 @@
+"""
+MongoDB-backed cache for LLM responses
+
+Many prompts (stems/distractors for the same concept, re-analysis of the
+same chapter) repeat across sessions. Caching responses keyed by a hash
+of (model, temperature, messages) turns those repeats into a single
+Mongo lookup instead of a full LLM round-trip.
+"""
+
+import os
+import hashlib
+from datetime import datetime
+
+from database import get_sync_database
+
+LLM_CACHE_COLLECTION = "llm_cache"
+
+# Set LLM_CACHE_ENABLED=0 to bypass the cache entirely
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "1") == "1"
+
+
+class CachedLLMResponse:
+    """Minimal response object matching the .content interface of chat models"""
+    def __init__(self, content: str):
+        self.content = content
+
+
+def _message_text(msg) -> str:
+    """Serialize one message (LangChain object or dict) for hashing"""
+    if hasattr(msg, 'type') and hasattr(msg, 'content'):
+        return f"{msg.type}:{msg.content}"
+    if isinstance(msg, dict):
+        return f"{msg.get('role', 'user')}:{msg.get('content', '')}"
+    return str(msg)
+
+
+def prompt_cache_key(model: str, temperature: float, messages) -> str:
+    """Stable hash identifying an LLM call"""
+    h = hashlib.blake2b(digest_size=32)
+    h.update(f"{model}|{temperature}".encode("utf-8"))
+    for msg in messages:
+        h.update(b"\x00")
+        h.update(_message_text(msg).encode("utf-8"))
+    return h.hexdigest()
+
+
+class CachedLLM:
+    """
+    Wrapper adding a MongoDB-backed response cache to any chat model
+    client with an .invoke(messages) interface.
+
+    Cache misses pass through to the wrapped client and store the
+    response; database errors degrade to calling the LLM directly.
+    """
+
+    def __init__(self, llm, model: str, temperature: float):
+        self.llm = llm
+        self.model = model
+        self.temperature = temperature
+
+    def invoke(self, messages):
+        key = prompt_cache_key(self.model, self.temperature, messages)
+
+        try:
+            cache = get_sync_database()[LLM_CACHE_COLLECTION]
+            cached = cache.find_one({"_id": key}, {"response": 1})
+            if cached is not None:
+                return CachedLLMResponse(content=cached["response"])
+        except Exception as e:
+            print(f"⚠ LLM cache lookup failed, calling LLM directly: {e}")
+            return self.llm.invoke(messages)
+
+        response = self.llm.invoke(messages)
+
+        try:
+            cache.update_one(
+                {"_id": key},
+                {"$set": {
+                    "response": response.content,
+                    "model": self.model,
+                    "temperature": self.temperature,
+                    "created_at": datetime.utcnow()
+                }},
+                upsert=True
+            )
+        except Exception as e:
+            print(f"⚠ LLM cache store failed: {e}")
+
+        return response
@@ -0,0 +1,60 @@
+"""
+Shared LLM client factory
+
+Builds and caches chat model clients so repeated node invocations (and
+repeated API requests) reuse the same underlying SDK client and its
+HTTP connection pool instead of paying credential parsing + TLS setup
+every time.
+"""
+
+from langchain_openai import ChatOpenAI
+from langchain_anthropic import ChatAnthropic
+from langchain_google_genai import ChatGoogleGenerativeAI
+from utils.groq_wrapper import ChatGroq
+from utils.llm_cache import CachedLLM, LLM_CACHE_ENABLED
+
+# Cache keyed by (provider, model, temperature)
+_LLM_CACHE = {}
+
+
+def get_llm(provider: str, model: str, temperature: float):
+    """
+    Get a chat model client for the given provider/model/temperature.
+
+    Clients are created once and cached for the process lifetime, so
+    back-to-back LLM calls reuse keep-alive connections.
+
+    Args:
+        provider: "anthropic", "openai", "gemini", or "groq"
+        model: Model name
+        temperature: Sampling temperature
+
+    Returns:
+        Chat model client with an .invoke(messages) interface
+
+    Raises:
+        ValueError: If the provider is not supported
+    """
+    key = (provider, model, temperature)
+    llm = _LLM_CACHE.get(key)
+    if llm is not None:
+        return llm
+
+    if provider == "anthropic":
+        llm = ChatAnthropic(model=model, temperature=temperature)
+    elif provider == "openai":
+        llm = ChatOpenAI(model=model, temperature=temperature)
+    elif provider == "gemini":
+        llm = ChatGoogleGenerativeAI(model=model, temperature=temperature)
+    elif provider == "groq":
+        llm = ChatGroq(model=model, temperature=temperature)
+    else:
+        raise ValueError(f"Unsupported LLM provider: {provider}")
+
+    # Wrap with the MongoDB response cache so repeated prompts skip the
+    # provider round-trip entirely (disable with LLM_CACHE_ENABLED=0)
+    if LLM_CACHE_ENABLED:
+        llm = CachedLLM(llm, model=model, temperature=temperature)
+
+    _LLM_CACHE[key] = llm
+    return llm
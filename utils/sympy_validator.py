@@ -1,174 +1,571 @@
 """
 SymPy Integration Utilities
 
-Mathematical validation using symbolic computation.
+Mathematical validation using symbolic computation with robust LaTeX
+parsing. This is the single validator module — the former v1/v2 split
+doubled the SymPy import cost and maintained parallel regex tables;
+sympy_validator_v2 now just re-exports from here.
 """
 
+import os
+import numpy as np
 import sympy as sp
-from sympy import symbols, integrate, diff, simplify, latex, sympify
-from sympy.parsing.latex import parse_latex
-from typing import Tuple, Optional
+from sympy import symbols, integrate, diff, simplify, latex, parse_expr
+from sympy.parsing.sympy_parser import (
+    standard_transformations,
+    implicit_multiplication_application,
+    convert_xor,
+)
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FuturesTimeout
+from typing import List, Tuple, Optional
 import re
 
+# Grammar-driven LaTeX parser (optional): a single ANTLR-generated pass
+# that handles nesting the regex chain below only approximates. Falls
+# back to the regex pipeline when the package isn't installed.
+try:
+    from latex2sympy2 import latex2sympy as _latex2sympy
+except ImportError:
+    _latex2sympy = None
+
+# Shared integration variable: every MCQ in this pipeline integrates over
+# x, so build the Symbol once instead of per call. Declared real so
+# derivatives of Abs/sign forms (\ln|x| answers) evaluate instead of
+# stalling on complex-derivative terms. Other variables are cached on
+# first use — Symbol construction hashes an assumptions dict and is not
+# free on hot paths.
+_X = symbols('x', real=True)
+_VAR_CACHE = {'x': _X}
+
+# Constants of integration, zeroed out of answers in one subs pass
+_CONST_ZEROS = {sp.Symbol(name): 0 for name in ('c', 'C', 'k', 'K')}
+
+# Parser configuration assembled once: standard transformations plus
+# implicit multiplication (3x, 2sin(x)) and ^ as exponent
+_TRANSFORMS = standard_transformations + (implicit_multiplication_application, convert_xor)
+_LOCALS = {'x': _X, 'e': sp.E, 'pi': sp.pi}
+
+
+def _sym(name: str) -> sp.Symbol:
+    """Cached Symbol lookup for the integration variable"""
+    var = _VAR_CACHE.get(name)
+    if var is None:
+        var = _VAR_CACHE[name] = symbols(name)
+    return var
+
+
+# Wall-clock budget for a single simplify/integrate call; one adversarial
+# candidate answer must not stall the whole generation pipeline
+CAS_TIMEOUT_SECONDS = float(os.getenv("CAS_TIMEOUT_SECONDS", "2.0"))
+
+_CAS_POOL = None
+_CAS_POOL_PID = None
+
+
+def _cas_call(fn, *args):
+    """Run a CAS operation with a wall-clock timeout
+
+    SIGALRM is unusable off the main thread (and under a server), so the
+    call runs on a small thread pool and the caller waits with a
+    deadline. Raises concurrent.futures.TimeoutError on expiry — the
+    abandoned call finishes in the background but nothing waits on it.
+    The pool is rebuilt after a fork since worker threads don't survive
+    into ProcessPoolExecutor children.
+    """
+    global _CAS_POOL, _CAS_POOL_PID
+    pid = os.getpid()
+    if _CAS_POOL is None or _CAS_POOL_PID != pid:
+        _CAS_POOL = ThreadPoolExecutor(max_workers=4)
+        _CAS_POOL_PID = pid
+    future = _CAS_POOL.submit(fn, *args)
+    try:
+        return future.result(timeout=CAS_TIMEOUT_SECONDS)
+    except FuturesTimeout:
+        future.cancel()
+        raise
+
+# All LaTeX cleanup is done by one compiled alternation + dispatch
+# callback: a single pass over the string instead of one full scan (and
+# one string allocation) per command. Alternatives are ordered so the
+# structured forms (\sin^{2}(x), \left() win over the bare commands;
+# \frac and \sqrt are expanded separately by the brace-counting scans.
+_CMD_MAP = {
+    r'\sin': 'sin', r'\cos': 'cos', r'\tan': 'tan',
+    r'\sec': 'sec', r'\csc': 'csc', r'\cot': 'cot',
+    r'\ln': 'log', r'\log': 'log',
+    r'\exp': 'exp', r'\pi': 'pi',
+    r'\cdot': '*', r'\times': '*',
+    r'\left(': '(', r'\right)': ')',
+    r'\left': '', r'\right': '',
+    r'\,': ' ', r'\:': ' ', r'\;': ' ', r'\!': ' ', '\\ ': ' ',
+    '$': '',
+}
+
+_LATEX_TOKEN_RE = re.compile(
+    r'(?P<abs>\|(?P<aarg>[^|]++)\|)'
+    r'|(?P<trigpowargs>\\(?P<tpaname>sin|cos|tan|sec|csc|cot)\^\{(?P<tpaexp>\d++)\}\((?P<tpaarg>[^)]++)\))'
+    r'|(?P<trigpowbare>\\(?P<tpbname>sin|cos|tan)\^\{(?P<tpbexp>\d+)\}\s+(?P<tpbarg>[a-zA-Z0-9]+))'
+    r'|(?P<invtrig>\\(?P<invname>sin|cos|tan)\^\{-1\})'
+    r'|(?P<trigpow>\\(?P<tpname>sin|cos|tan)\^\{(?P<tpexp>\d++)\})'
+    r'|(?P<cmd>\\left\(|\\right\)|\\(?:sin|cos|tan|sec|csc|cot|ln|log|exp|pi|cdot|times|left|right)(?![a-zA-Z])|\\[,:;!]|\\ |\$)'
+)
+
+# Constant of integration tacked onto answers: "... + C"
+_CONST_RE = re.compile(r'\s*\+\s*[CcKk](?![A-Za-z(])')
+
+_IMPLICIT_MUL_RE = re.compile(r'(\d+)([a-zA-Z])')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def _rewrite_token(m: re.Match) -> str:
+    """Dispatch one matched LaTeX token to its SymPy-friendly spelling"""
+    # Bare commands dominate real expressions, so try the straight
+    # dict lookup before the structured alternatives
+    cmd = m.group('cmd')
+    if cmd is not None:
+        return _CMD_MAP[cmd]
+    if m.group('abs') is not None:
+        return '(Abs(%s))' % m.group('aarg')
+    if m.group('trigpowargs') is not None:
+        return '%s(%s)**%s' % (m.group('tpaname'), m.group('tpaarg'), m.group('tpaexp'))
+    if m.group('trigpowbare') is not None:
+        return '%s(%s)**%s' % (m.group('tpbname'), m.group('tpbarg'), m.group('tpbexp'))
+    if m.group('invtrig') is not None:
+        return 'a%s' % m.group('invname')
+    return '%s**%s' % (m.group('tpname'), m.group('tpexp'))
+
+
+def _read_braced(s: str, i: int) -> Tuple[str, int]:
+    """Read the {...} group starting at s[i]; returns (content, index past '}')
+
+    Raises ValueError when s[i] is not '{' or the group never closes.
+    """
+    if i >= len(s) or s[i] != '{':
+        raise ValueError("expected '{'")
+    depth = 0
+    for j in range(i, len(s)):
+        c = s[j]
+        if c == '{':
+            depth += 1
+        elif c == '}':
+            depth -= 1
+            if depth == 0:
+                return s[i + 1:j], j + 1
+    raise ValueError("unbalanced braces")
+
+
+def _expand_fracs(s: str) -> str:
+    """Rewrite \\frac{num}{den} as ((num)/(den)) at any nesting depth
+
+    A brace-counting scan finds each matching closer, and arguments are
+    expanded recursively so fracs nested inside fracs resolve too.
+    """
+    if '\\frac' not in s:
+        return s
+    out = []
+    i, n = 0, len(s)
+    while True:
+        # str.find jumps between occurrences at C speed; the interpreter
+        # only runs on the commands themselves, not every character
+        hit = s.find('\\frac', i)
+        if hit == -1:
+            out.append(s[i:])
+            break
+        out.append(s[i:hit])
+        try:
+            j = hit + 5
+            while j < n and s[j].isspace():
+                j += 1
+            num, j = _read_braced(s, j)
+            k = j
+            while k < n and s[k].isspace():
+                k += 1
+            den, k = _read_braced(s, k)
+        except ValueError:
+            out.append(s[hit])
+            i = hit + 1
+            continue
+        out.append('((%s)/(%s))' % (_expand_fracs(num), _expand_fracs(den)))
+        i = k
+    return ''.join(out)
+
+
+def _expand_sqrts(s: str) -> str:
+    """Rewrite \\sqrt{arg} as sqrt(arg) at any nesting depth"""
+    if '\\sqrt' not in s:
+        return s
+    out = []
+    i, n = 0, len(s)
+    while True:
+        hit = s.find('\\sqrt', i)
+        if hit == -1:
+            out.append(s[i:])
+            break
+        out.append(s[i:hit])
+        try:
+            j = hit + 5
+            while j < n and s[j].isspace():
+                j += 1
+            arg, j = _read_braced(s, j)
+        except ValueError:
+            out.append(s[hit])
+            i = hit + 1
+            continue
+        out.append('sqrt(%s)' % _expand_sqrts(arg))
+        i = j
+    return ''.join(out)
+
+_INTEGRAND_RE = re.compile(
+    # One alternation covers $\int ... dx$ (with optional bounds and
+    # optional \, spacing) and the Unicode-integral form in a single scan
+    r'\$\\int(?:_\{[^}]++\}\^\{[^}]++\})?\s+(?P<body>.+?)\s+(?:\\,\s*)?dx\$'
+    r'|∫\s*(?P<ubody>.+?)\s*dx'
+)
+
+
+def _normalize(latex_expr: str) -> str:
+    """Rewrite a LaTeX expression into a parser-friendly string"""
+    cleaned = latex_expr.strip()
+
+    # Brace-counting scans expand \frac and \sqrt to arbitrary depth,
+    # then one fused token pass handles everything else
+    cleaned = _expand_fracs(cleaned)
+    cleaned = _expand_sqrts(cleaned)
+    cleaned = _LATEX_TOKEN_RE.sub(_rewrite_token, cleaned)
+
+    # Drop trailing constants of integration (C, c, K, k)
+    cleaned = _CONST_RE.sub('', cleaned)
+
+    # Implicit multiplication the tokenizer can't see: 7x -> 7*x
+    cleaned = _IMPLICIT_MUL_RE.sub(r'\1*\2', cleaned)
+
+    return _WHITESPACE_RE.sub(' ', cleaned).strip()
+
+
+@lru_cache(maxsize=4096)
+def _parse(cleaned: str) -> Optional[sp.Expr]:
+    """Parse a normalized expression string, memoized on the cleaned form
+
+    Different LaTeX spellings of the same expression normalize to one
+    string, so caching here also dedupes across formatting variants.
+    """
+    try:
+        return parse_expr(cleaned, local_dict=_LOCALS, transformations=_TRANSFORMS)
+    except Exception:
+        return None
+
 
 def latex_to_sympy(latex_expr: str) -> Optional[sp.Expr]:
     """
     Convert LaTeX expression to SymPy expression.
-    
+
     Args:
         latex_expr: LaTeX string (without $ delimiters)
-    
+
     Returns:
         SymPy expression or None if parsing fails
     """
+    s = latex_expr.strip().replace('$', '')
+    if not s:
+        return None
+
+    # Fast path: bare variables and plain numbers are common (bounds,
+    # coefficients, simple answers) and need none of the machinery below.
+    # Check _LOCALS first so 'e' keeps meaning Euler's number, as it does
+    # on the parse_expr path.
+    if len(s) == 1 and s.isalpha():
+        known = _LOCALS.get(s)
+        return known if known is not None else _sym(s)
+    unsigned = s[1:] if s[0] in '+-' else s
+    if unsigned.isdigit():
+        return sp.Integer(s)
+    if unsigned.replace('.', '', 1).isdigit():
+        return sp.Float(s)
+
+    if _latex2sympy is not None:
+        try:
+            stripped = _CONST_RE.sub('', s)
+            expr = _latex2sympy(stripped)
+            if expr is not None:
+                # The grammar parser builds its own assumption-free x;
+                # remap onto the shared real Symbol so expressions from
+                # both parsers compare and subtract cleanly.
+                return expr.subs(sp.Symbol('x'), _X)
+        except Exception:
+            pass  # fall through to the regex pipeline
+
     try:
-        # Clean up common LaTeX patterns that SymPy struggles with
-        cleaned = latex_expr.strip()
-        
-        # Remove $ if present
-        cleaned = cleaned.replace('$', '')
-        
-        # Remove spacing commands
-        cleaned = cleaned.replace(r'\,', '')
-        cleaned = cleaned.replace(r'\:', '')
-        cleaned = cleaned.replace(r'\;', '')
-        cleaned = cleaned.replace(r'\left', '')
-        cleaned = cleaned.replace(r'\right', '')
-        
-        # Replace fractions FIRST before other processing
-        # Match \frac{numerator}{denominator}
-        cleaned = re.sub(r'\\frac\{([^{}]+)\}\{([^{}]+)\}', r'((\1)/(\2))', cleaned)
-        
-        # Replace common operators
-        cleaned = cleaned.replace(r'\cdot', '*')
-        cleaned = cleaned.replace(r'\times', '*')
-        
-        # Replace trig functions
-        cleaned = re.sub(r'\\sin\^\{(-?\d+)\}', r'sin**\1', cleaned)
-        cleaned = re.sub(r'\\cos\^\{(-?\d+)\}', r'cos**\1', cleaned)
-        cleaned = re.sub(r'\\tan\^\{(-?\d+)\}', r'tan**\1', cleaned)
-        cleaned = cleaned.replace(r'\sin', 'sin')
-        cleaned = cleaned.replace(r'\cos', 'cos')
-        cleaned = cleaned.replace(r'\tan', 'tan')
-        cleaned = cleaned.replace(r'\sec', 'sec')
-        cleaned = cleaned.replace(r'\csc', 'csc')
-        cleaned = cleaned.replace(r'\cot', 'cot')
-        
-        # Replace inverse trig
-        cleaned = re.sub(r'\\sin\^\{-1\}', 'asin', cleaned)
-        cleaned = re.sub(r'\\cos\^\{-1\}', 'acos', cleaned)
-        cleaned = re.sub(r'\\tan\^\{-1\}', 'atan', cleaned)
-        
-        # Replace log functions
-        cleaned = cleaned.replace(r'\ln', 'log')
-        cleaned = cleaned.replace(r'\log', 'log')
-        
-        # Replace sqrt
-        cleaned = re.sub(r'\\sqrt\{([^}]+)\}', r'sqrt(\1)', cleaned)
-        
-        # Replace absolute values
-        cleaned = re.sub(r'\|([^|]+)\|', r'Abs(\1)', cleaned)
-        
-        # Replace exponentials
-        cleaned = cleaned.replace(r'\exp', 'exp')
-        
-        # Replace pi
-        cleaned = cleaned.replace(r'\pi', 'pi')
-        
-        # Clean up constants (C, c, k, K)
-        for const in ['C', 'c', 'K', 'k']:
-            cleaned = cleaned.replace(f' + {const}', '')
-            cleaned = cleaned.replace(f'+ {const}', '')
-            cleaned = cleaned.replace(f'+{const}', '')
-        
-        # Try to parse with sympify
-        expr = sympify(cleaned, locals={'x': symbols('x'), 'e': sp.E})
-        return expr
-    
-    except Exception as e:
+        return _parse(_normalize(latex_expr))
+    except Exception:
         # Silently return None, error already logged by caller
         return None
 
 
+@lru_cache(maxsize=1024)
+def _answer_expr(answer_latex: str) -> Optional[sp.Expr]:
+    """Parse an answer and drop its constant of integration (c, C, k, K)"""
+    answer = latex_to_sympy(answer_latex)
+    if answer is None:
+        return None
+    return answer.subs(_CONST_ZEROS)
+
+
+@lru_cache(maxsize=1024)
+def _diff_and_simplify(answer_latex: str, variable: str) -> Optional[sp.Expr]:
+    """Differentiate a parsed answer and simplify the result
+
+    Cached separately from verify_integration: the same candidate answer
+    is compared against several integrands, and the simplify call is the
+    expensive half of each comparison.
+    """
+    answer = _answer_expr(answer_latex)
+    if answer is None:
+        return None
+    var = _sym(variable)
+    return _cas_call(simplify, diff(answer, var))
+
+
+# Sample grid for the float comparison; wide enough to separate
+# structurally different answers, dense enough to not miss local
+# disagreements of typical MCQ integrands
+_XS = np.linspace(-3, 3, 32)
+
+
+@lru_cache(maxsize=256)
+def _integrand_fn(integrand_latex: str, variable: str):
+    """Lambdified integrand, cached per LaTeX string
+
+    Validation batches compare one integrand against many candidate
+    answers, so the integrand side of the numeric check compiles once.
+    """
+    expr = latex_to_sympy(integrand_latex)
+    if expr is None:
+        return None
+    var = _sym(variable)
+    try:
+        return sp.lambdify(var, expr, 'numpy')
+    except Exception:
+        return None
+
+
+def _numeric_agreement(integrand_latex: str, derivative: sp.Expr, variable: str) -> Optional[bool]:
+    """Float comparison of integrand vs derivative on the sample grid
+
+    Returns True on close agreement, False on clear disagreement, and
+    None when the check is inconclusive (lambdify failure, too few
+    points inside both domains, or a borderline error) — only the None
+    case falls through to the symbolic tactics. Grid evaluation costs
+    microseconds against milliseconds-to-seconds for simplify.
+    """
+    f = _integrand_fn(integrand_latex, variable)
+    if f is None:
+        return None
+    try:
+        var = _sym(variable)
+        g = sp.lambdify(var, derivative, 'numpy')
+        with np.errstate(all='ignore'):
+            fv = np.broadcast_to(np.asarray(f(_XS), dtype=complex), _XS.shape)
+            gv = np.broadcast_to(np.asarray(g(_XS), dtype=complex), _XS.shape)
+    except Exception:
+        return None
+
+    finite = np.isfinite(fv) & np.isfinite(gv)
+    if np.count_nonzero(finite) < 8:
+        return None
+    fv, gv = fv[finite], gv[finite]
+    if np.allclose(fv, gv, rtol=1e-6, atol=1e-8):
+        return True
+    relative_err = float(np.max(np.abs(fv - gv) / (1.0 + np.abs(fv))))
+    return False if relative_err > 1e-4 else None
+
+
 def verify_integration(integrand_latex: str, answer_latex: str, variable: str = 'x') -> Tuple[bool, float, Optional[str]]:
     """
     Verify that answer is correct by differentiating and comparing to integrand.
-    
+
+    Memoized: identical (integrand, answer) pairs recur across retries and
+    re-validation passes, and each simplify/integrate run is expensive.
+    Timeouts are reported but not memoized — a transiently saturated CAS
+    pool must not brand a pair wrong for the process lifetime — which is
+    why the timeout is caught here, outside the cached worker (lru_cache
+    never caches a raising call).
+
     Args:
         integrand_latex: The function being integrated (LaTeX)
         answer_latex: The proposed integral result (LaTeX)
         variable: Variable of integration (default 'x')
-    
+
     Returns:
         (is_correct, confidence_score, correction_or_error_message)
     """
     try:
-        var = symbols(variable)
-        
+        return _verify_integration_cached(integrand_latex, answer_latex, variable)
+    except FuturesTimeout:
+        return False, 0.0, "Verification timed out"
+
+
+@lru_cache(maxsize=256)
+def _verify_integration_cached(integrand_latex: str, answer_latex: str, variable: str) -> Tuple[bool, float, Optional[str]]:
+    """Cached verification body; lets FuturesTimeout escape uncached"""
+    try:
+        var = _sym(variable)
+
         # Parse integrand and answer
         integrand = latex_to_sympy(integrand_latex)
-        answer = latex_to_sympy(answer_latex)
-        
+        answer = _answer_expr(answer_latex)
+
         if integrand is None:
             return False, 0.0, "Could not parse integrand"
         if answer is None:
             return False, 0.0, "Could not parse answer"
-        
-        # Remove constant of integration if present (c, C, k, K, etc.)
-        answer_no_const = answer
-        for const in [sp.Symbol('c'), sp.Symbol('C'), sp.Symbol('k'), sp.Symbol('K')]:
-            answer_no_const = answer_no_const.subs(const, 0)
-        
-        # Differentiate the answer
-        derivative = diff(answer_no_const, var)
-        derivative_simplified = simplify(derivative)
-        
-        # Compare with integrand
-        difference = simplify(integrand - derivative_simplified)
-        
+
+        # Cheap float comparison first: it settles most candidates in
+        # either direction without any symbolic simplification
+        derivative = diff(answer, var)
+        agreement = _numeric_agreement(integrand_latex, derivative, variable)
+        if agreement is False:
+            try:
+                correct_answer = _cas_call(integrate, integrand, var)
+                correct_latex = f"${latex(correct_answer)} + c$"
+                return False, 0.0, f"Correct answer: {correct_latex}"
+            except FuturesTimeout:
+                raise
+            except Exception:
+                return False, 0.0, f"Derivative {derivative} doesn't match integrand {integrand}"
+        if agreement is True:
+            return True, 0.95, None
+
+        # Structural tactics first: expand and together decide equality
+        # for polynomial/rational integrands — the bulk of MCQ calculus —
+        # at a fraction of simplify's cost
+        difference = integrand - derivative
+        if difference.expand() == 0:
+            return True, 1.0, None
+        if sp.together(difference) == 0:
+            return True, 1.0, None
+
+        # Differentiate the answer (cached: candidate answers recur
+        # across comparisons against different integrands)
+        derivative_simplified = _diff_and_simplify(answer_latex, variable)
+
+        # Trig identities: trigsimp is the targeted tool, cheaper than
+        # simplifying a sin-rewrite of the whole difference
+        if difference.has(sp.sin, sp.cos, sp.tan, sp.sec, sp.csc, sp.cot):
+            if _cas_call(sp.trigsimp, integrand - derivative_simplified) == 0:
+                return True, 0.9, None
+
+        # Full simplify is the last resort
+        difference = _cas_call(simplify, integrand - derivative_simplified)
         if difference == 0:
             return True, 1.0, None
-        
-        # Try harder simplification
-        expanded_diff = simplify(difference.expand())
+
+        expanded_diff = _cas_call(simplify, difference.expand())
         if expanded_diff == 0:
             return True, 0.95, None
-        
-        # Check if they're equivalent under trig identities
-        trig_simplified = simplify(difference.rewrite(sp.sin))
-        if trig_simplified == 0:
-            return True, 0.9, None
-        
+
         # If not equal, try to compute correct answer
         try:
-            correct_answer = integrate(integrand, var)
+            correct_answer = _cas_call(integrate, integrand, var)
             correct_latex = f"${latex(correct_answer)} + c$"
             return False, 0.0, f"Correct answer: {correct_latex}"
-        except:
+        except FuturesTimeout:
+            raise
+        except Exception:
             return False, 0.0, f"Derivative {derivative_simplified} doesn't match integrand {integrand}"
-    
+
+    except FuturesTimeout:
+        raise
     except Exception as e:
         return False, 0.0, f"Validation error: {str(e)}"
 
 
-def compute_integral(integrand_latex: str, variable: str = 'x', 
-                     definite: bool = False, lower_bound: Optional[str] = None, 
+def _verify_pair(pair: Tuple[str, str]) -> Tuple[bool, float, Optional[str]]:
+    """Module-level adapter so pairs pickle cleanly for worker processes"""
+    return verify_integration(*pair)
+
+
+def _warm_worker():
+    """Pool initializer: pay SymPy's symbol and parser warm-up once per worker"""
+    symbols('x y t n k')
+    latex_to_sympy("x")
+
+
+_POOL: Optional[ProcessPoolExecutor] = None
+
+
+def _get_pool(max_workers: int = None) -> ProcessPoolExecutor:
+    """Shared worker pool, created lazily and reused across batches
+
+    max_workers only takes effect on the first call; subsequent batches
+    reuse the already-spawned workers (and their warm SymPy caches).
+    """
+    global _POOL
+    if _POOL is None:
+        _POOL = ProcessPoolExecutor(max_workers=max_workers, initializer=_warm_worker)
+    return _POOL
+
+
+def verify_integration_many(pairs: List[Tuple[str, str]], max_workers: int = None) -> List[Tuple[bool, float, Optional[str]]]:
+    """
+    Verify many (integrand_latex, answer_latex) pairs in parallel.
+
+    SymPy's simplify/integrate are CPU-bound and hold the GIL, so batch
+    validation fans out across processes rather than threads. The pool
+    persists between batches, so process spawn and SymPy initialization
+    are paid once per session rather than once per batch.
+
+    Args:
+        pairs: (integrand_latex, answer_latex) tuples
+        max_workers: Process count for the first batch (default: os.cpu_count())
+
+    Returns:
+        List of (is_correct, confidence_score, message), same order as pairs
+    """
+    if not pairs:
+        return []
+    return list(_get_pool(max_workers).map(_verify_pair, pairs, chunksize=4))
+
+
+def compute_integral(integrand_latex: str, variable: str = 'x',
+                     definite: bool = False, lower_bound: Optional[str] = None,
                      upper_bound: Optional[str] = None) -> Optional[str]:
     """
     Compute integral using SymPy.
-    
+
+    Memoized: the same integrand is recomputed for corrections, option
+    generation and re-validation within a session. As with
+    verify_integration, a CAS timeout is converted to None here, outside
+    the cached worker, so a transiently saturated pool doesn't pin a
+    permanent failure in the cache.
+
     Args:
         integrand_latex: Function to integrate (LaTeX)
         variable: Variable of integration
         definite: Whether it's a definite integral
         lower_bound: Lower limit (LaTeX) if definite
         upper_bound: Upper limit (LaTeX) if definite
-    
+
     Returns:
         LaTeX string of result or None if computation fails
     """
     try:
-        var = symbols(variable)
+        return _compute_integral_cached(
+            integrand_latex, variable, definite, lower_bound, upper_bound
+        )
+    except FuturesTimeout:
+        print(f"Error computing integral: timed out after {CAS_TIMEOUT_SECONDS}s")
+        return None
+
+
+@lru_cache(maxsize=2048)
+def _compute_integral_cached(integrand_latex: str, variable: str,
+                             definite: bool, lower_bound: Optional[str],
+                             upper_bound: Optional[str]) -> Optional[str]:
+    """Cached integration body; lets FuturesTimeout escape uncached"""
+    try:
+        var = _sym(variable)
         integrand = latex_to_sympy(integrand_latex)
         
         if integrand is None:
@@ -181,15 +578,17 @@ def compute_integral(integrand_latex: str, variable: str = 'x',
             if lower is None or upper is None:
                 return None
             
-            result = integrate(integrand, (var, lower, upper))
+            result = _cas_call(integrate, integrand, (var, lower, upper))
         else:
-            result = integrate(integrand, var)
-        
-        result_simplified = simplify(result)
+            result = _cas_call(integrate, integrand, var)
+
+        result_simplified = _cas_call(simplify, result)
         latex_result = latex(result_simplified)
         
         return f"${latex_result}$" if not definite else f"${latex_result}$"
-    
+
+    except FuturesTimeout:
+        raise
     except Exception as e:
         print(f"Error computing integral: {e}")
         return None
@@ -205,16 +604,12 @@ def extract_integrand_from_question(question_stem: str) -> Optional[str]:
     Returns:
         LaTeX string of integrand or None
     """
-    # Look for ∫...dx pattern or \int ... dx pattern
-    patterns = [
-        r'\$\\int\s+(.+?)\s+dx\$',  # \int f(x) dx
-        r'\$\\int_\{[^}]+\}\^\{[^}]+\}\s+(.+?)\s+dx\$',  # \int_a^b f(x) dx
-        r'∫\s*(.+?)\s*dx',  # Unicode integral
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, question_stem)
-        if match:
-            return match.group(1).strip()
-    
+    match = _INTEGRAND_RE.search(question_stem)
+    if match:
+        return (match.group('body') or match.group('ubody')).strip()
     return None
+
+
+# Warm the parser path once at import so the first real validation call
+# doesn't pay the parser/module initialization cost
+latex_to_sympy("x + 1")